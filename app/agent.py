@@ -1,46 +1,107 @@
 import os
 from datetime import date
 
-os.environ["RESOURCES_LOCATION"] = "us-central1"
-os.environ["GOOGLE_CLOUD_PROJECT"] = "qwiklabs-gcp-00-2a88a82239a1"
-os.environ["GENERIC_MODEL"] = "gemini-2.5-flash"
-os.environ["ADVANCED_MODEL"] = "gemini-2.5-pro"
-os.environ["FIRESTORE_PROJECT"] = "qwiklabs-gcp-00-2a88a82239a1"
-os.environ["GOOGLE_GENAI_USE_VERTEXAI"] = "1"
-os.environ["GOOGLE_CLOUD_LOCATION"] = "us-central1"
-os.environ["BQ_DATA_PROJECT_ID"] = "qwiklabs-gcp-00-2a88a82239a1"
-os.environ["BQ_COMPUTE_PROJECT_ID"] = "qwiklabs-gcp-00-2a88a82239a1"
-os.environ["BQ_DATASET_ID"] = "business_data"
-os.environ["RESOURCES_PROJECT"] = "qwiklabs-gcp-00-2a88a82239a1"
-os.environ["BUSINESS_CONFIG_JSON_PROJECT"] = "qwiklabs-gcp-00-2a88a82239a1"
-os.environ["BUSINESS_CONFIIG_JSON_BUCKET"] = "config_test0912391"
-os.environ["BUSINESS_CONFIIG_JSON_FILE"] = "business_config.json"
-os.environ["STRATEGIES_JSON_PROJECT"] = "qwiklabs-gcp-00-2a88a82239a1"
-os.environ["STRATEGIES_JSON_BUCKET"] = "config_test0912391"
-os.environ["STRATEGIES_JSON_FILE"] = "strategies.json"
-
-date_today = date.today()
+# Defaults only; values already provided (env_vars.txt / load_env_vars / the runtime) win.
+_DEFAULTS = {
+    "RESOURCES_LOCATION": "us-central1",
+    "GOOGLE_CLOUD_PROJECT": "qwiklabs-gcp-00-2a88a82239a1",
+    "GENERIC_MODEL": "gemini-2.5-flash",
+    "ADVANCED_MODEL": "gemini-2.5-pro",
+    "FIRESTORE_PROJECT": "qwiklabs-gcp-00-2a88a82239a1",
+    "GOOGLE_GENAI_USE_VERTEXAI": "1",
+    "GOOGLE_CLOUD_LOCATION": "us-central1",
+    "BQ_DATA_PROJECT_ID": "qwiklabs-gcp-00-2a88a82239a1",
+    "BQ_COMPUTE_PROJECT_ID": "qwiklabs-gcp-00-2a88a82239a1",
+    "BQ_DATASET_ID": "business_data",
+    "RESOURCES_PROJECT": "qwiklabs-gcp-00-2a88a82239a1",
+    "BUSINESS_CONFIG_JSON_PROJECT": "qwiklabs-gcp-00-2a88a82239a1",
+    "BUSINESS_CONFIIG_JSON_BUCKET": "config_test0912391",
+    "BUSINESS_CONFIIG_JSON_FILE": "business_config.json",
+    "STRATEGIES_JSON_PROJECT": "qwiklabs-gcp-00-2a88a82239a1",
+    "STRATEGIES_JSON_BUCKET": "config_test0912391",
+    "STRATEGIES_JSON_FILE": "strategies.json",
+}
+os.environ.update({k: v for k, v in _DEFAULTS.items() if k not in os.environ})
+
 project = os.getenv("RESOURCES_PROJECT")
 location = os.getenv("RESOURCES_LOCATION")
 
 
-from google.genai import types
-from google.adk.agents import Agent
+import functools
+
 from .prompts import return_instructions_root
-from .tools import call_data_analytics_agent, call_resource_agent, call_search_agent, call_storage_agent
 
 
+def add_current_date(callback_context, llm_request):
+    """
+    before_model_callback: append today's date as a trailing user-role message.
+
+    Evaluated per request, so long-running containers never report a stale date,
+    and kept out of the system prompt so that prefix is identical on every replica.
+    """
+    from google.genai import types
+
+    llm_request.contents.append(
+        types.Content(
+            role="user",
+            parts=[types.Part.from_text(text=f"Today: {date.today().isoformat()}")],
+        )
+    )
+    return None
+
+
+def build_agent(model: str | None = None, tools: list | None = None, temperature: float = 0.3):
+    """
+    Build a PromoSphere root agent. Defaults match the deployed `root_agent`.
+
+    google.adk / google.genai and the sub-agent tree pull in gRPC, protobuf and
+    the Cloud client libraries, so they are only imported once an agent is
+    actually needed (ADK's loader resolves `root_agent` on the first request).
+    """
+    from google.adk.agents import Agent
+    from google.genai import types
 
-root_agent = Agent(
-    model=os.getenv("GENERIC_MODEL"),
-    name="promosphere",
-    instruction=return_instructions_root(resource_project_id=project, resource_project_location=location),
-    global_instruction=f"""
+    from .tools import call_data_analytics_agent, call_resource_agent, call_search_agent, call_storage_agent
+    from .utils.generation import GEN_CFG_MED
+    from .utils.prompt_cache import ENABLE_PROMPT_CACHE, PromptCache
+
+    if tools is None:
+        tools = [call_data_analytics_agent, call_resource_agent, call_search_agent, call_storage_agent]
+
+    # Explicit context cache for the root instruction + tool declarations (ENABLE_PROMPT_CACHE=1).
+    root_prompt_cache = PromptCache(display_name="promosphere-root")
+
+    return Agent(
+        model=model or os.getenv("GENERIC_MODEL"),
+        name="promosphere",
+        # ADK sends global_instruction + instruction as one system prompt; keep it free
+        # of per-day values (the date is injected per request) so it stays cacheable.
+        instruction=return_instructions_root(resource_project_id=project, resource_project_location=location),
+        global_instruction="""
     You are PromoSphere, an assistant for creating, monitoring, and optimizing marketing campaigns.
     Focus on campaign performance, ROI, and customer impact using BigQuery data and related sources.
     Provide clear insights and actionable recommendations.
-    Today's date: {date_today}
     """,
-    tools=[call_data_analytics_agent, call_resource_agent, call_search_agent, call_storage_agent],
-    generate_content_config=types.GenerateContentConfig(temperature=0.3),
-)
+        tools=tools,
+        generate_content_config=(
+            GEN_CFG_MED if temperature == GEN_CFG_MED.temperature
+            else types.GenerateContentConfig(temperature=temperature)
+        ),
+        before_model_callback=(
+            [add_current_date, root_prompt_cache.before_model_callback]
+            if ENABLE_PROMPT_CACHE
+            else add_current_date
+        ),
+    )
+
+
+@functools.cache
+def build_root_agent():
+    """Build the process-wide `root_agent` once."""
+    return build_agent()
+
+def __getattr__(name: str):
+    # `from app.agent import root_agent` keeps working; the agent is built lazily.
+    if name == "root_agent":
+        return build_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,13 @@
 import os
+import json
 import logging
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 
 import google.auth
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from google.adk.cli.fast_api import get_fast_api_app
 
 try:
@@ -10,17 +15,8 @@ try:
 except Exception:  
     google_cloud_logging = None
 
-try:
-    from vertexai import agent_engines
-except Exception: 
-    agent_engines = None
-
-from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider, export
-
 from app.utils.gcs import create_bucket_if_not_exists
-from app.utils.tracing import CloudTraceLoggingSpanExporter
-from app.utils.typing import Feedback
+from app.utils.typing import Feedback, StreamRequest
 from app.utils.load_env_vars import load_env_vars
 
 ENV_FILE = os.getenv("ENV_FILE", "env_vars.txt")
@@ -43,16 +39,44 @@ except Exception:
     # Keep project_id as env or None; don't crash
     pass
 
-if google_cloud_logging and project_id:
+use_vertex = os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "0") == "1"
+# Resolved AgentEngine resource name, persisted so later starts skip agent_engines.list().
+AGENT_ENGINE_CACHE_FILE = os.getenv("AGENT_ENGINE_CACHE_FILE", "/tmp/.promosphere_agent_engine")
+# Written once the artifact bucket is known to exist; warm restarts skip the GCS round-trip.
+ARTIFACT_BUCKET_SENTINEL = os.getenv("ARTIFACT_BUCKET_SENTINEL", "/tmp/.bucket_ok")
+
+
+def _setup_cloud_logging() -> None:
+    if not (google_cloud_logging and project_id):
+        return
     try:
+        from google.cloud.logging_v2.handlers import CloudLoggingHandler, setup_logging
+        from google.cloud.logging_v2.handlers.transports import (
+            BackgroundThreadTransport,
+        )
+
         logging_client = google_cloud_logging.Client(project=project_id)
-        logging_client.setup_logging()  # route std logging to Cloud Logging
+        # Batch records on a background thread instead of one API call per record;
+        # setup_logging() also keeps the client's own loggers from recursing.
+        handler = CloudLoggingHandler(logging_client, transport=BackgroundThreadTransport)
+        setup_logging(handler)
         logger.info("[startup] Cloud Logging is enabled")
     except Exception as e:  # pragma: no cover
         logger.warning("[startup] Cloud Logging init failed: %s", e)
 
-if project_id:
+
+def _ensure_artifact_bucket() -> str | None:
+    if not project_id:
+        logger.warning("[startup] GOOGLE_CLOUD_PROJECT not set; skipping bucket creation")
+        return None
     bucket_uri = f"gs://{project_id}-promosphere-logs-data"
+    sentinel = pathlib.Path(ARTIFACT_BUCKET_SENTINEL)
+    try:
+        if sentinel.read_text() == bucket_uri:
+            logger.info("[startup] Artifact bucket already ensured: %s", bucket_uri)
+            return bucket_uri
+    except OSError:
+        pass
     try:
         create_bucket_if_not_exists(
             bucket_name=bucket_uri,
@@ -60,28 +84,47 @@ if project_id:
             location=os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
         )
         logger.info("[startup] Artifact bucket ready: %s", bucket_uri)
+        try:
+            sentinel.write_text(bucket_uri)
+        except OSError as e:
+            logger.warning("[startup] Could not write bucket sentinel: %s", e)
     except Exception as e:
         logger.warning("[startup] Could not ensure bucket %s: %s", bucket_uri, e)
-else:
-    bucket_uri = None
-    logger.warning("[startup] GOOGLE_CLOUD_PROJECT not set; skipping bucket creation")
+    return bucket_uri
 
 
-try:
-    provider = TracerProvider()
-    processor = export.BatchSpanProcessor(CloudTraceLoggingSpanExporter())
-    provider.add_span_processor(processor)
-    trace.set_tracer_provider(provider)
-    logger.info("[startup] OpenTelemetry tracing configured")
-except Exception as e:  
-    logger.warning("[startup] Tracing setup failed: %s", e)
+def _init_agent_engine():
+    agent_engines = None
+    if use_vertex:
+        # vertexai is heavy; only import it when AgentEngine sessions can actually be used.
+        try:
+            from vertexai import agent_engines
+        except Exception:
+            agent_engines = None
 
+    if not (use_vertex and agent_engines and project_id):
+        if use_vertex and not agent_engines:
+            logger.warning("[startup] vertexai.agent_engines not importable; skipping")
+        elif use_vertex and not project_id:
+            logger.warning("[startup] GOOGLE_CLOUD_PROJECT missing; skipping AgentEngine")
+        else:
+            logger.info("[startup] GOOGLE_GENAI_USE_VERTEXAI=0; AgentEngine disabled")
+        return None
 
-use_vertex = os.getenv("GOOGLE_GENAI_USE_VERTEXAI", "0") == "1"
-agent_engine = None
-session_service_uri = None
+    cache_file = pathlib.Path(AGENT_ENGINE_CACHE_FILE)
+    try:
+        cached_name = cache_file.read_text().strip()
+    except OSError:
+        cached_name = ""
+    if cached_name:
+        try:
+            # Single-resource GET is much cheaper than the list() below.
+            agent_engine = agent_engines.get(cached_name)
+            logger.info("[startup] Reusing cached AgentEngine: %s", agent_engine.resource_name)
+            return agent_engine
+        except Exception as e:
+            logger.info("[startup] Cached AgentEngine %s not usable: %s", cached_name, e)
 
-if use_vertex and agent_engines and project_id:
     try:
         agent_name = os.environ.get("AGENT_ENGINE_SESSION_NAME", "promosphere")
         existing = list(agent_engines.list(filter=f"display_name={agent_name}"))
@@ -91,19 +134,67 @@ if use_vertex and agent_engines and project_id:
         else:
             agent_engine = agent_engines.create(display_name=agent_name)
             logger.info("[startup] Created AgentEngine: %s", agent_engine.resource_name)
-
-        session_service_uri = f"agentengine://{agent_engine.resource_name}"
+        try:
+            cache_file.write_text(agent_engine.resource_name)
+        except OSError as e:
+            logger.warning("[startup] Could not cache AgentEngine name: %s", e)
+        return agent_engine
     except Exception as e:
         logger.warning(
             "[startup] Vertex AgentEngine unavailable, continuing without it: %s", e
         )
-else:
-    if use_vertex and not agent_engines:
-        logger.warning("[startup] vertexai.agent_engines not importable; skipping")
-    elif use_vertex and not project_id:
-        logger.warning("[startup] GOOGLE_CLOUD_PROJECT missing; skipping AgentEngine")
-    else:
-        logger.info("[startup] GOOGLE_GENAI_USE_VERTEXAI=0; AgentEngine disabled")
+        return None
+
+
+# The three startup round-trips are independent; run them concurrently so
+# cold start pays max(t_i) instead of sum(t_i). Each task handles its own errors.
+with ThreadPoolExecutor(max_workers=3) as _startup_pool:
+    _logging_future = _startup_pool.submit(_setup_cloud_logging)
+    _bucket_future = _startup_pool.submit(_ensure_artifact_bucket)
+    _engine_future = _startup_pool.submit(_init_agent_engine)
+_logging_future.result()
+bucket_uri = _bucket_future.result()
+agent_engine = _engine_future.result()
+session_service_uri = (
+    f"agentengine://{agent_engine.resource_name}" if agent_engine else None
+)
+
+def _setup_tracing():
+    """Install the Cloud Trace exporter; returns the provider so it can be shut down."""
+    try:
+        # Imported here so a failing/slow tracing stack never blocks the rest of startup.
+        from opentelemetry import trace
+        from opentelemetry.sdk.trace import TracerProvider, export
+
+        from app.utils.tracing import CloudTraceLoggingSpanExporter
+
+        provider = TracerProvider()
+        # Bounded queue sized for single-agent throughput (SDK default is 2048 spans).
+        processor = export.BatchSpanProcessor(
+            CloudTraceLoggingSpanExporter(),
+            max_queue_size=512,
+            max_export_batch_size=128,
+            schedule_delay_millis=2000,
+        )
+        provider.add_span_processor(processor)
+        trace.set_tracer_provider(provider)
+        logger.info("[startup] OpenTelemetry tracing configured")
+        return provider
+    except Exception as e:
+        logger.warning("[startup] Tracing setup failed: %s", e)
+        return None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    provider = _setup_tracing()
+    try:
+        yield
+    finally:
+        # Flush pending spans and stop the exporter thread so SIGTERM exits promptly.
+        if provider is not None:
+            provider.shutdown()
+
 
 allow_origins = (
     os.getenv("ALLOW_ORIGINS", "").split(",") if os.getenv("ALLOW_ORIGINS") else None
@@ -117,22 +208,93 @@ app: FastAPI = get_fast_api_app(
     web=True,
     artifact_service_uri=bucket_uri,  
     allow_origins=allow_origins,
-    session_service_uri=session_service_uri, 
+    session_service_uri=session_service_uri,
+    lifespan=lifespan,
 )
 
 app.title = "promosphere"
 app.description = "API for interacting with the Agent promosphere"
 
 
+_FEEDBACK_OK = {"status": "success"}
+_FEEDBACK_FAIL = {"status": "ok"}
+
+
 @app.post("/feedback")
 def collect_feedback(feedback: Feedback) -> dict[str, str]:
     """Collect and log feedback."""
     try:
-        logger.info("feedback: %s", feedback.model_dump())
-        return {"status": "success"}
+        logger.info("feedback: %s", feedback.model_dump_json())
+        return _FEEDBACK_OK
     except Exception as e:
         logger.warning("feedback logging failed: %s", e)
-        return {"status": "ok"}  
+        return _FEEDBACK_FAIL
+
+
+# Sessions created by /stream live in the same store (and app name) as ADK's own endpoints.
+STREAM_APP_NAME = "app"
+_stream_runner = None
+
+
+def _get_stream_runner():
+    """Build the Runner used by /stream on first use (imports the agent tree lazily)."""
+    global _stream_runner
+    if _stream_runner is None:
+        from google.adk.runners import Runner
+        from google.adk.sessions import InMemorySessionService, VertexAiSessionService
+
+        from app.agent import root_agent
+
+        if agent_engine is not None:
+            session_service = VertexAiSessionService(
+                project=project_id,
+                location=os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
+                agent_engine_id=agent_engine.resource_name.split("/")[-1],
+            )
+        else:
+            session_service = InMemorySessionService()
+        _stream_runner = Runner(
+            agent=root_agent, app_name=STREAM_APP_NAME, session_service=session_service
+        )
+    return _stream_runner
+
+
+@app.post("/stream")
+async def stream_agent(request: StreamRequest) -> StreamingResponse:
+    """Run the root agent and stream its events back as Server-Sent Events."""
+    from google.adk.agents.run_config import RunConfig, StreamingMode
+
+    runner = _get_stream_runner()
+    session = None
+    if request.session_id:
+        session = await runner.session_service.get_session(
+            app_name=STREAM_APP_NAME,
+            user_id=request.user_id,
+            session_id=request.session_id,
+        )
+    if session is None:
+        session = await runner.session_service.create_session(
+            app_name=STREAM_APP_NAME, user_id=request.user_id
+        )
+
+    async def event_stream():
+        try:
+            async for event in runner.run_async(
+                user_id=request.user_id,
+                session_id=session.id,
+                new_message=request.message,
+                run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+            ):
+                yield f"data: {event.model_dump_json(exclude_none=True, by_alias=True)}\n\n"
+        except Exception as e:
+            logger.warning("stream failed: %s", e)
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"X-Session-Id": session.id},
+    )
 
 
 if __name__ == "__main__":
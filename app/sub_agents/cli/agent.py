@@ -2,7 +2,7 @@
 
 import os
 from google.adk.agents import Agent
-from google.genai import types
+from ...utils.generation import GEN_CFG_LOW
 
 from .prompts import return_instructions_cli_agent
 from .tools import cli_run_tool, cli_gcloud_tool, call_search_agent
@@ -16,5 +16,5 @@ cli_agent = Agent(
     name="cli_agent",
     instruction=return_instructions_cli_agent(resources_project=RESOURCES_PROJECT, resources_location=RESOURCES_LOCATION),
     tools=[cli_run_tool, cli_gcloud_tool, call_search_agent],
-    generate_content_config=types.GenerateContentConfig(temperature=0.01),
+    generate_content_config=GEN_CFG_LOW,
 )
\ No newline at end of file
@@ -1,4 +1,8 @@
+import asyncio
+import logging
 import subprocess
+import time
+from collections import OrderedDict
 from typing import Any, Dict, Optional
 
 from google.adk.tools import FunctionTool
@@ -7,6 +11,22 @@ from ..search.agent import search_agent
 from google.adk.tools import ToolContext
 from google.adk.tools.agent_tool import AgentTool
 
+from ...utils.semantic_cache import SemanticCache
+
+_SEARCH_AGENT_TOOL = AgentTool(agent=search_agent)
+
+log = logging.getLogger(__name__)
+
+SEARCH_CACHE_TTL_SECONDS = 300
+SEARCH_CACHE_MAXSIZE = 256
+
+# request -> (monotonic timestamp, search agent output), oldest first
+_search_cache: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+_search_inflight: dict[str, "asyncio.Future[Any]"] = {}
+# Created on first use, inside the loop that serves requests (see _get_search_lock).
+_search_lock: asyncio.Lock | None = None
+_semantic_search_cache = SemanticCache(ttl_seconds=SEARCH_CACHE_TTL_SECONDS)
+
 
 def cli_run(
     cmd: str,
@@ -44,6 +64,13 @@ def cli_run(
             "stdout": e.output or "",
             "stderr": e.stderr or "",
         }
+    except subprocess.TimeoutExpired as e:
+        return {
+            "status": "error",
+            "return_code": -1,
+            "stdout": "",
+            "stderr": f"Command timed out after {e.timeout} seconds",
+        }
 
 
 cli_run_tool = FunctionTool(func=cli_run)
@@ -86,6 +113,20 @@ def cli_gcloud(
             "stdout": e.output or "",
             "stderr": e.stderr or "",
         }
+    except subprocess.TimeoutExpired as e:
+        return {
+            "status": "error",
+            "return_code": -1,
+            "stdout": "",
+            "stderr": f"Command timed out after {e.timeout} seconds",
+        }
+
+def _get_search_lock() -> asyncio.Lock:
+    global _search_lock
+    if _search_lock is None:
+        _search_lock = asyncio.Lock()
+    return _search_lock
+
 
 async def call_search_agent(
     request: str,
@@ -100,13 +141,59 @@ async def call_search_agent(
                  - "Find the correct usage of cloud scheduler jobs create"
                  - "Find gcloud cli cloud function parameters."
     """
-    print("\ncall_search_agent with request:", request)
-    agent_tool = AgentTool(agent=search_agent)
-    search_agent_output = await agent_tool.run_async(
-        args={"request": request}, tool_context=tool_context
-    )
+    log.debug("call_search_agent with request: %s", request)
+    key = request.strip()
+
+    # Identical requests (often from concurrent sessions) share one search run:
+    # recent results come from the TTL cache, in-flight ones are awaited.
+    async with _get_search_lock():
+        hit = _search_cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < SEARCH_CACHE_TTL_SECONDS:
+            _search_cache.move_to_end(key)
+            tool_context.state["search_agent_output"] = hit[1]
+            log.debug("search_agent_output (cached) = %s", hit[1])
+            return hit[1]
+        future = _search_inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = asyncio.get_running_loop().create_future()
+            _search_inflight[key] = future
+
+    if not is_owner:
+        search_agent_output = await asyncio.shield(future)
+        tool_context.state["search_agent_output"] = search_agent_output
+        log.debug("search_agent_output (shared) = %s", search_agent_output)
+        return search_agent_output
+
+    try:
+        # Paraphrases of an earlier request reuse its answer instead of a new search run.
+        embedding = await _semantic_search_cache.embed(key)
+        search_agent_output = _semantic_search_cache.lookup(embedding, key)
+        if search_agent_output is None:
+            search_agent_output = await _SEARCH_AGENT_TOOL.run_async(
+                args={"request": request}, tool_context=tool_context
+            )
+            _semantic_search_cache.add(embedding, key, search_agent_output)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved when nobody else is waiting
+        raise
+    else:
+        future.set_result(search_agent_output)
+        async with _get_search_lock():
+            _search_cache[key] = (time.monotonic(), search_agent_output)
+            _search_cache.move_to_end(key)
+            while len(_search_cache) > SEARCH_CACHE_MAXSIZE:
+                _search_cache.popitem(last=False)
+    finally:
+        async with _get_search_lock():
+            _search_inflight.pop(key, None)
+
     tool_context.state["search_agent_output"] = search_agent_output
-    print("search_agent_output =", search_agent_output)
+    log.debug("search_agent_output = %s", search_agent_output)
     return search_agent_output
 
 
@@ -1,57 +1,73 @@
+import functools
+import os
 import subprocess
 import shlex
-from typing import Union, List, Tuple, Optional, Dict
+from typing import Union
+
+CLI_TIMEOUT_SECONDS = float(os.getenv("CLI_TIMEOUT_SECONDS", "60"))
+
+
+@functools.lru_cache(maxsize=128)
+def _split_cached(cmd: str) -> tuple[str, ...]:
+    """shlex.split is slow (a fresh lexer per call); agents tend to repeat commands."""
+    return tuple(shlex.split(cmd))
 
 
 def run_cli(
-    cmd: Union[str, List[str]],
+    cmd: Union[str, list[str]],
     check: bool = True,
-    cwd: Optional[str] = None,
-    env: Optional[Dict[str, str]] = None
-) -> Tuple[int, str, str]:
+    cwd: str | None = None,
+    env: dict[str, str] | None = None,
+    timeout: float | None = CLI_TIMEOUT_SECONDS,
+) -> tuple[int, str, str]:
     """
     Execute a shell command.
 
     Args:
-        cmd: Command to run. Can be a single string (will be shell-split) or a list of arguments.
+        cmd: Command to run. Prefer a list of arguments; a single string is shell-split (slow path).
         check: If True, raises CalledProcessError on non-zero exit.
         cwd: Optional working directory in which to run the command.
         env: Optional dict of environment variables to override.
+        timeout: Seconds before the process is killed (raises subprocess.TimeoutExpired).
 
     Returns:
         A tuple (return_code, stdout, stderr).
     """
-    if isinstance(cmd, str):
-        args = shlex.split(cmd)
-    else:
-        args = cmd
+    # Tokenize ourselves and exec the binary directly: no /bin/sh fork, no shell injection.
+    # subprocess takes any sequence, so the memoized tuple is passed uncopied.
+    args = _split_cached(cmd) if isinstance(cmd, str) else cmd
 
     result = subprocess.run(
         args,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
+        shell=False,
+        capture_output=True,
+        bufsize=-1,
         cwd=cwd,
         env=env,
+        timeout=timeout,
     )
+    # Capture raw bytes and decode each stream once instead of via incremental text wrappers.
+    stdout = result.stdout.decode("utf-8", errors="replace")
+    stderr = result.stderr.decode("utf-8", errors="replace")
 
     if check and result.returncode != 0:
         raise subprocess.CalledProcessError(
             returncode=result.returncode,
             cmd=cmd,
-            output=result.stdout,
-            stderr=result.stderr,
+            output=stdout,
+            stderr=stderr,
         )
 
-    return result.returncode, result.stdout, result.stderr
+    return result.returncode, stdout, stderr
 
 
 def run_gcloud(
-    gcloud_args: Union[str, List[str]],
+    gcloud_args: Union[str, list[str]],
     check: bool = True,
-    cwd: Optional[str] = None,
-    env: Optional[Dict[str, str]] = None
-) -> Tuple[int, str, str]:
+    cwd: str | None = None,
+    env: dict[str, str] | None = None,
+    timeout: float | None = CLI_TIMEOUT_SECONDS,
+) -> tuple[int, str, str]:
     """
     Execute a `gcloud` CLI command.
 
@@ -60,14 +76,15 @@ def run_gcloud(
         check: If True, raises CalledProcessError on non-zero exit.
         cwd: Optional working directory.
         env: Optional environment variables dict.
+        timeout: Seconds before the process is killed.
 
     Returns:
         A tuple (return_code, stdout, stderr).
     """
+    # Prepend the `gcloud` executable, building the final argv in one allocation
     if isinstance(gcloud_args, str):
-        args = shlex.split(gcloud_args)
+        args = ["gcloud", *_split_cached(gcloud_args)]
     else:
-        args = gcloud_args
+        args = ["gcloud", *gcloud_args]
 
-    # Prepend the `gcloud` executable
-    return run_cli(["gcloud"] + args, check=check, cwd=cwd, env=env)
\ No newline at end of file
+    return run_cli(args, check=check, cwd=cwd, env=env, timeout=timeout)
\ No newline at end of file
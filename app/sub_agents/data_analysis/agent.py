@@ -2,22 +2,28 @@
 Get data (natural language to sql)
 It can use natural language - pythin to do analysis on data.
 """
+import functools
 import os
 from datetime import date
-from google.genai import types
 from google.adk.agents import Agent
+from google.adk.agents.readonly_context import ReadonlyContext
+from ...utils.generation import GEN_CFG_LOW
 from .prompts import return_instructions_data_analysis
 from .tools import call_db_query_agent, call_data_analyzer_agent
 from google.adk.agents.callback_context import CallbackContext
 from .sub_agents.bigquery.tools import (
     get_database_settings as get_bq_database_settings,
 )
-date_today = date.today()
 
 
 def setup_before_agent_call(callback_context: CallbackContext):
     """Setup the agent."""
 
+    # Refreshed per turn so a long-running process never reports a stale date.
+    today = date.today().isoformat()
+    if callback_context.state.get("_date") != today:
+        callback_context.state["_date"] = today
+
     if "database_settings" not in callback_context.state:
         db_settings = dict()
         db_settings["use_database"] = "BigQuery"
@@ -25,30 +31,52 @@ def setup_before_agent_call(callback_context: CallbackContext):
 
     if callback_context.state["all_db_settings"]["use_database"] == "BigQuery":
         callback_context.state["database_settings"] = get_bq_database_settings()
-        schema = callback_context.state["database_settings"]["bq_ddl_schema"]
 
-        callback_context._invocation_context.agent.instruction = (
-            return_instructions_data_analysis()
-            + f"""
+
+@functools.lru_cache(maxsize=8)
+def _instruction_for_schema(schema: str) -> str:
+    """Build (once per distinct schema) the instruction with the schema appended."""
+    return "".join([
+        return_instructions_data_analysis(),
+        """
 
     --------- The BigQuery schema of the relevant data with a few sample rows. ---------
-    {schema}
+    """,
+        schema,
+        """
+
+    """,
+    ])
+
+
+def instruction(context: ReadonlyContext) -> str:
+    """Compose the instruction from the schema in state; no shared Agent mutation per turn."""
+    settings = context.state.get("database_settings") or {}
+    schema = settings.get("bq_ddl_schema")
+    if not schema:
+        return return_instructions_data_analysis()
+    return _instruction_for_schema(schema)
 
-    """
-        )
+
+@functools.lru_cache(maxsize=4)
+def _global_instruction_for(today: str) -> str:
+    return f"""
+        You are a Data Science and Data Analytics Multi Agent System.
+        Todays date: {today}
+        """
+
+
+def global_instruction(context: ReadonlyContext) -> str:
+    """Rebuilt only when the date in state changes (see setup_before_agent_call)."""
+    return _global_instruction_for(context.state.get("_date") or date.today().isoformat())
 
 
 data_analysis_agent = Agent(
     model=os.getenv("GENERIC_MODEL"),
     name="data_analysis_agent",
-    instruction=return_instructions_data_analysis(),
+    instruction=instruction,
     before_agent_callback=setup_before_agent_call,
-    global_instruction=(
-        f"""
-        You are a Data Science and Data Analytics Multi Agent System.
-        Todays date: {date_today}
-        """
-    ),
+    global_instruction=global_instruction,
     tools=[call_db_query_agent,call_data_analyzer_agent],
-    generate_content_config=types.GenerateContentConfig(temperature=0.01),
+    generate_content_config=GEN_CFG_LOW,
 )
@@ -4,8 +4,8 @@ import os
 
 from google.adk.agents import Agent
 from google.adk.agents.callback_context import CallbackContext
-from google.genai import types
 
+from .....utils.generation import GEN_CFG_LOW
 from . import tools
 from .prompts import return_instructions_bigquery
 
@@ -27,5 +27,5 @@ database_query_agent = Agent(
         tools.run_bigquery_validation,
     ],
     before_agent_callback=setup_before_agent_call,
-    generate_content_config=types.GenerateContentConfig(temperature=0.01),
+    generate_content_config=GEN_CFG_LOW,
 )
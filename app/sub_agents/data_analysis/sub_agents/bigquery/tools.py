@@ -3,20 +3,32 @@
 from __future__ import annotations
 
 import datetime
+import functools
+import hashlib
+import itertools
 import logging
+import math
 import os
+import pathlib
 import re
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Optional
 
-import numpy as np
-import pandas as pd
 from google.adk.tools import ToolContext
-from google.cloud import bigquery
-from google.genai import Client
 
 from ....data_analysis.utils.utils import get_env_var
 
+# The BigQuery, auth and GenAI client libraries are imported where first used so
+# building the agent tree does not pay for them; annotations only need the names.
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+    from google.genai import Client
+
 # ------------------------------------------------------------------------------
 # Logging
 # ------------------------------------------------------------------------------
@@ -31,70 +43,193 @@ if not LOGGER.handlers:
 # Constants / Config
 # ------------------------------------------------------------------------------
 MAX_NUM_ROWS: int = int(os.getenv("NL2SQL_MAX_ROWS", "80"))
-DISALLOWED_DML_RE = re.compile(
-    r"(?i)\b(update|delete|drop|insert|create|alter|truncate|merge)\b"
+# Rows per page when reading the schema discovery query.
+SCHEMA_PAGE_SIZE: int = int(os.getenv("BQ_SCHEMA_PAGE_SIZE", "1000"))
+# Seconds a DDL snapshot is served before get_database_settings rebuilds it.
+SCHEMA_TTL_SECONDS: int = int(os.getenv("BQ_SCHEMA_TTL_S", "3600"))
+# Append example rows to each table's DDL (BQ_INCLUDE_SAMPLES=0 emits columns only).
+INCLUDE_SAMPLES: bool = os.getenv("BQ_INCLUDE_SAMPLES", "1") == "1"
+# Example rows appended to each table's DDL.
+SAMPLE_ROWS: int = int(os.getenv("BQ_SAMPLE_ROWS", "5"))
+# Per-request timeout for NL2SQL generation calls.
+LLM_TIMEOUT_MS: int = int(os.getenv("NL2SQL_LLM_TIMEOUT_MS", "60000"))
+# Memoized NL2SQL drafts (set BQ_NL2SQL_CACHE_DISABLED=1 to always call the model).
+NL2SQL_CACHE_MAXSIZE: int = int(os.getenv("BQ_NL2SQL_CACHE_MAXSIZE", "256"))
+NL2SQL_CACHE_DISABLED: bool = os.getenv("BQ_NL2SQL_CACHE_DISABLED", "0") == "1"
+# On-disk per-table DDL cache shared across restarts ("" disables it).
+DDL_CACHE_DIR: str = os.getenv("BQ_DDL_CACHE_DIR", "/tmp/bq_ddl_cache")
+DDL_CACHE_TTL_SECONDS: int = int(os.getenv("BQ_DDL_CACHE_TTL_S", "86400"))
+# Dry-run each validated query first; refuse ones that would scan more than MAX_SCAN_BYTES.
+DRY_RUN_ENABLED: bool = os.getenv("BQ_DRY_RUN", "1") == "1"
+MAX_SCAN_BYTES: int = int(os.getenv("BQ_MAX_SCAN_BYTES", str(10 * 1024**3)))
+# Server-side billing cap on the validation query itself (defaults to the dry-run limit).
+MAX_BILLED_BYTES: int = int(os.getenv("BQ_MAX_BILLED_BYTES", str(MAX_SCAN_BYTES)))
+# Concurrent per-table metadata/sample fetches during schema discovery.
+SCHEMA_FETCH_WORKERS: int = int(os.getenv("BQ_SCHEMA_FETCH_WORKERS", "16"))
+# Escaped quotes/newlines left in model-emitted SQL, normalized in a single pass.
+_ESCAPE_RE = re.compile(r"""\\(["'\n]|n)""")
+_ESCAPE_MAP = {'"': '"', "'": "'", "\n": "\n", "n": "\n"}
+_HAS_LIMIT_RE = re.compile(r"\blimit\b", re.IGNORECASE)
+_DATE_FIELD_TYPES = frozenset({"DATE", "DATETIME", "TIMESTAMP"})
+_DATETIME_TYPES = (datetime.datetime, datetime.date)
+# Backslash and single-quote escaping for SQL string literals, in one translate() pass.
+_SQL_STR_TRANS = str.maketrans({"\\": "\\\\", "'": "''"})
+# Read-only guard: one linear \w+ scan + set lookup per token, no alternation backtracking.
+DISALLOWED_DML_KEYWORDS = frozenset(
+    {"update", "delete", "drop", "insert", "create", "alter", "truncate", "merge"}
 )
+_WORD_RE = re.compile(r"\w+")
 
-# ------------------------------------------------------------------------------
-# Lazy singletons
-# ------------------------------------------------------------------------------
-_bq_client: Optional[bigquery.Client] = None
-_llm_client: Optional[Client] = None
+# (prompt digest, model) -> generated SQL, oldest first. The prompt embeds the schema
+# snapshot, so a schema change naturally produces new keys.
+_nl2sql_cache: OrderedDict[tuple, str] = OrderedDict()
+_nl2sql_cache_lock = threading.Lock()
+
+# (table path, table_type) -> (last_modified_time ms, DDL chunk) from the latest snapshot.
+# One entry per table, so a table that keeps changing replaces its entry instead of adding one.
+_TABLE_DDL_CACHE: dict[tuple, tuple] = {}
+_SAMPLE_FAILED_NOTE = "-- NOTE: Could not retrieve sample rows for table"
 
 # ------------------------------------------------------------------------------
 # Public globals kept for backward-compat (but filled via getters)
 # ------------------------------------------------------------------------------
-database_settings: Optional[Dict[str, Any]] = None
+database_settings: Optional[dict[str, Any]] = None
+# (dataset_id, data_project_id, compute_project_id) -> (expiry monotonic time, settings)
+_settings_cache: dict[tuple, tuple] = {}
+_settings_lock = threading.Lock()
+
+
+# ==============================================================================
+# Config
+# ==============================================================================
+@dataclass(frozen=True)
+class BQConfig:
+    """Environment-derived BigQuery/Vertex settings, validated once."""
+
+    data_project_id: str
+    compute_project_id: str
+    dataset_id: str
+    vertex_project_id: Optional[str]
+    location: str
+
+
+@functools.cache
+def get_bq_config() -> BQConfig:
+    """Read (and validate) the env vars on first use rather than at import, so the
+    module can be imported before env_vars.txt is loaded; cache_clear() re-reads them."""
+    return BQConfig(
+        data_project_id=get_env_var("BQ_DATA_PROJECT_ID"),
+        compute_project_id=get_env_var("BQ_COMPUTE_PROJECT_ID"),
+        dataset_id=get_env_var("BQ_DATASET_ID"),
+        vertex_project_id=os.getenv("GOOGLE_CLOUD_PROJECT"),
+        location=os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
+    )
 
 
 # ==============================================================================
 # Clients
 # ==============================================================================
+def _locked_singleton(fn: Callable[[], Any]) -> Callable[[], Any]:
+    """lru_cache'd zero-arg factory whose first build is serialized, so concurrent
+    first callers share one instance; .cache_clear() forces a rebuild."""
+    cached = functools.cache(fn)
+    lock = threading.Lock()
+
+    @functools.wraps(fn)
+    def wrapper():
+        # Double-checked: once built, calls read the cache without the lock.
+        if cached.cache_info().currsize:
+            return cached()
+        with lock:
+            return cached()
+
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+@_locked_singleton
 def get_bq_client() -> bigquery.Client:
     """Get or create a BigQuery client (compute project)."""
-    global _bq_client
-    if _bq_client is None:
-        compute_project = get_env_var("BQ_COMPUTE_PROJECT_ID")
-        LOGGER.info("Creating BigQuery client (project=%s)", compute_project)
-        _bq_client = bigquery.Client(project=compute_project)
-    return _bq_client
+    import google.auth
+    import requests
+    from google.auth.transport.requests import AuthorizedSession
+    from google.cloud import bigquery
+
+    compute_project = get_bq_config().compute_project_id
+    LOGGER.info("Creating BigQuery client (project=%s)", compute_project)
+    # requests' default pool keeps 10 connections per host; size it for the schema
+    # fan-out so concurrent calls reuse warm TLS connections instead of discarding them.
+    credentials, _ = google.auth.default(scopes=bigquery.Client.SCOPE)
+    session = AuthorizedSession(credentials)
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=SCHEMA_FETCH_WORKERS, pool_maxsize=SCHEMA_FETCH_WORKERS
+    )
+    session.mount("https://", adapter)
+    return bigquery.Client(project=compute_project, credentials=credentials, _http=session)
 
 
+@_locked_singleton
 def get_llm_client() -> Client:
     """Get or create a Google GenAI client (Vertex mode)."""
-    global _llm_client
-    if _llm_client is None:
-        project = os.getenv("GOOGLE_CLOUD_PROJECT")
-        location = os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1")
-        LOGGER.info("Initializing GenAI client (vertexai=True, project=%s, location=%s)", project, location)
-        _llm_client = Client(vertexai=True, project=project, location=location)
-    return _llm_client
+    from google.genai import Client, types
+
+    config = get_bq_config()
+    project, location = config.vertex_project_id, config.location
+    LOGGER.info("Initializing GenAI client (vertexai=True, project=%s, location=%s)", project, location)
+    # The client keeps one pooled (keep-alive) HTTP connection set for its lifetime;
+    # the timeout (ms) bounds a stuck draft/validate/retry round.
+    return Client(
+        vertexai=True,
+        project=project,
+        location=location,
+        http_options=types.HttpOptions(timeout=LLM_TIMEOUT_MS),
+    )
 
 
 # ==============================================================================
 # Database settings cache
 # ==============================================================================
-def get_database_settings() -> Dict[str, Any]:
-    """Return cached DB settings; build if missing."""
+def get_database_settings() -> dict[str, Any]:
+    """Return cached DB settings; rebuild when missing or older than SCHEMA_TTL_SECONDS."""
     global database_settings
-    if database_settings is None:
-        database_settings = update_database_settings()
+    config = get_bq_config()
+    key = (config.dataset_id, config.data_project_id, config.compute_project_id)
+    entry = _settings_cache.get(key)
+    if entry is None or time.monotonic() >= entry[0]:
+        # Double-checked so concurrent first callers trigger a single schema fetch.
+        with _settings_lock:
+            entry = _settings_cache.get(key)
+            if entry is None or time.monotonic() >= entry[0]:
+                entry = (time.monotonic() + SCHEMA_TTL_SECONDS, update_database_settings(*key))
+                _settings_cache[key] = entry
+    database_settings = entry[1]
     return database_settings
 
 
-def update_database_settings() -> Dict[str, Any]:
-    """Rebuild DDL schema snapshot for the dataset."""
+def update_database_settings(
+    dataset_id: Optional[str] = None,
+    data_project_id: Optional[str] = None,
+    compute_project_id: Optional[str] = None,
+) -> dict[str, Any]:
+    """Rebuild DDL schema snapshot for the dataset (ids default to get_bq_config())."""
     LOGGER.info("Updating database settings (DDL snapshot)")
+    if not (dataset_id and data_project_id and compute_project_id):
+        config = get_bq_config()
+        dataset_id = dataset_id or config.dataset_id
+        data_project_id = data_project_id or config.data_project_id
+        compute_project_id = compute_project_id or config.compute_project_id
     ddl_schema = get_bigquery_schema(
-        dataset_id=get_env_var("BQ_DATASET_ID"),
-        data_project_id=get_env_var("BQ_DATA_PROJECT_ID"),
+        dataset_id=dataset_id,
+        data_project_id=data_project_id,
         client=get_bq_client(),
-        compute_project_id=get_env_var("BQ_COMPUTE_PROJECT_ID"),
+        compute_project_id=compute_project_id,
     )
     settings = {
-        "bq_project_id": get_env_var("BQ_DATA_PROJECT_ID"),
-        "bq_dataset_id": get_env_var("BQ_DATASET_ID"),
+        "bq_project_id": data_project_id,
+        "bq_dataset_id": dataset_id,
         "bq_ddl_schema": ddl_schema,
+        # Formatted once per snapshot; initial_bq_nl2sql only appends the question.
+        "_nl2sql_prefix": _build_nl2sql_prefix(ddl_schema),
     }
     return settings
 
@@ -109,53 +244,180 @@ def get_bigquery_schema(
     compute_project_id: Optional[str] = None,
 ) -> str:
     """Retrieve schema and generate DDL (plus sample inserts) for a dataset."""
+    from google.cloud import bigquery
+
     if client is None:
         LOGGER.info("No BQ client provided; creating with compute project")
         client = bigquery.Client(project=compute_project_id)
 
     dataset_ref = bigquery.DatasetReference(data_project_id, dataset_id)
-    ddl_chunks: List[str] = []
+    ddl_chunks: list[str] = []
 
+    # One round trip for every table's type, last modification, view definition and
+    # column definitions; COLUMN_FIELD_PATHS contributes top-level column descriptions.
+    info_schema = f"`{data_project_id}.{dataset_id}.INFORMATION_SCHEMA"
     info_schema_query = (
-        "SELECT table_name "
-        f"FROM `{data_project_id}.{dataset_id}.INFORMATION_SCHEMA.TABLES`"
+        "SELECT t.table_name, t.table_type, m.last_modified_time, v.view_definition, "
+        "c.column_name, c.data_type, p.description "
+        f"FROM {info_schema}.TABLES` AS t "
+        f"LEFT JOIN `{data_project_id}.{dataset_id}.__TABLES__` AS m ON m.table_id = t.table_name "
+        f"LEFT JOIN {info_schema}.VIEWS` AS v USING (table_name) "
+        f"LEFT JOIN {info_schema}.COLUMNS` AS c USING (table_name) "
+        f"LEFT JOIN {info_schema}.COLUMN_FIELD_PATHS` AS p "
+        "ON p.table_name = c.table_name AND p.field_path = c.column_name "
+        "ORDER BY t.creation_time, t.table_name, c.ordinal_position"
     )
     LOGGER.debug("Schema discovery query: %s", info_schema_query)
 
-    for row in client.query(info_schema_query).result():
-        table_ref = dataset_ref.table(row.table_name)
-        table_obj = client.get_table(table_ref)
-        LOGGER.info("Discovered %s: %s", table_obj.table_type, table_ref.path)
-
-        if table_obj.table_type == "VIEW":
-            view_query = table_obj.view_query or ""
-            ddl_chunks.append(
-                "CREATE OR REPLACE VIEW `{}` AS\n{};\n\n".format(table_ref, view_query)
+    # table_name -> (table_type, last_modified_ms, view_definition,
+    #                [(column_name, data_type, description), ...]), in discovery order
+    tables: dict[str, tuple] = {}
+    # One row per column: large pages keep the getQueryResults round trips few.
+    for row in client.query(info_schema_query).result(page_size=SCHEMA_PAGE_SIZE):
+        _, _, _, columns = tables.setdefault(
+            row.table_name, (row.table_type, row.last_modified_time, row.view_definition, [])
+        )
+        if row.column_name is not None:
+            columns.append((row.column_name, row.data_type, row.description))
+
+    # Sampling (and the rare external-table get_table) is pure network wait; fan out
+    # (the client is thread-safe) and reassemble in discovery order.
+    if tables:
+        with ThreadPoolExecutor(max_workers=min(SCHEMA_FETCH_WORKERS, len(tables))) as ex:
+            ddl_chunks.extend(
+                ex.map(
+                    lambda item: _process_one_table(client, dataset_ref, item[0], *item[1]),
+                    tables.items(),
+                )
             )
-            continue
+    _prune_disk_cache()
 
-        if table_obj.table_type == "EXTERNAL":
-            _append_external_iceberg_ddl_if_applicable(ddl_chunks, table_obj)
-            continue
+    return "".join(ddl_chunks)
+
+
+def _process_one_table(
+    client: bigquery.Client,
+    dataset_ref: bigquery.DatasetReference,
+    table_name: str,
+    table_type: str,
+    last_modified: Optional[int],
+    view_definition: Optional[str],
+    columns: list[tuple],
+) -> str:
+    """Return the DDL chunk for one table/view ("" for unsupported types)."""
+    table_ref = dataset_ref.table(table_name)
+    LOGGER.info("Discovered %s: %s", table_type, table_ref.path)
+
+    # Unchanged since the last snapshot (schema, data and view edits all bump
+    # last_modified_time): reuse its DDL and skip the sampling/get_table calls.
+    # Process memory first, then the on-disk copy left by a previous process.
+    table_key = (table_ref.path, table_type)
+    if last_modified is not None:
+        modified, cached = _TABLE_DDL_CACHE.get(table_key, (None, None))
+        if modified != last_modified:
+            cached = _disk_cache_get(table_key, last_modified)
+        if cached is not None:
+            _TABLE_DDL_CACHE[table_key] = (last_modified, cached)
+            return cached
+
+    ddl = _build_table_ddl(client, table_ref, table_type, view_definition, columns)
+    if last_modified is not None and _SAMPLE_FAILED_NOTE not in ddl:
+        _TABLE_DDL_CACHE[table_key] = (last_modified, ddl)
+        _disk_cache_put(table_key, last_modified, ddl)
+    return ddl
 
-        if table_obj.table_type == "TABLE":
-            ddl_chunks.append(_ddl_for_table_with_samples(client, table_obj))
-            continue
 
-        # Skip other types (MATERIALIZED_VIEW, SNAPSHOT, etc.)
+def _disk_cache_path(table_key: tuple) -> Optional[pathlib.Path]:
+    if not DDL_CACHE_DIR:
+        return None
+    # One file per table, overwritten when it changes. Sampling settings change the
+    # chunk's content, so they are part of the name.
+    raw = repr((table_key, INCLUDE_SAMPLES, SAMPLE_ROWS)).encode()
+    return pathlib.Path(DDL_CACHE_DIR) / (hashlib.blake2b(raw, digest_size=16).hexdigest() + ".sql")
 
-    return "".join(ddl_chunks)
+
+def _disk_cache_header(last_modified: int) -> str:
+    return f"-- last_modified_time: {last_modified}"
+
+
+def _disk_cache_get(table_key: tuple, last_modified: int) -> Optional[str]:
+    path = _disk_cache_path(table_key)
+    if path is None:
+        return None
+    try:
+        if time.time() - path.stat().st_mtime > DDL_CACHE_TTL_SECONDS:
+            return None
+        header, _, ddl = path.read_text(encoding="utf-8").partition("\n")
+    except OSError:
+        return None
+    return ddl if header == _disk_cache_header(last_modified) else None
+
+
+def _disk_cache_put(table_key: tuple, last_modified: int, ddl: str) -> None:
+    path = _disk_cache_path(table_key)
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent workers never read a partial chunk.
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(f"{_disk_cache_header(last_modified)}\n{ddl}", encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as exc:
+        LOGGER.warning("Could not cache DDL for %s: %s", table_key[0], exc)
+
+
+def _prune_disk_cache() -> None:
+    """Delete cache files past their TTL: dropped tables and leftovers of failed writes."""
+    if not DDL_CACHE_DIR:
+        return
+    cutoff = time.time() - DDL_CACHE_TTL_SECONDS
+    try:
+        entries = list(os.scandir(DDL_CACHE_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+        except OSError:
+            pass
+
+
+def _build_table_ddl(
+    client: bigquery.Client,
+    table_ref: bigquery.TableReference,
+    table_type: str,
+    view_definition: Optional[str],
+    columns: list[tuple],
+) -> str:
+    if table_type == "BASE TABLE":
+        if not INCLUDE_SAMPLES:
+            return _table_ddl_header(table_ref, columns)
+        return _ddl_for_table_with_samples(client, table_ref, columns)
+
+    if table_type == "VIEW":
+        return "CREATE OR REPLACE VIEW `{}` AS\n{};\n\n".format(table_ref, view_definition or "")
+
+    # external_data_configuration is not in INFORMATION_SCHEMA; external tables are rare.
+    if table_type == "EXTERNAL":
+        chunks: list[str] = []
+        _append_external_iceberg_ddl_if_applicable(chunks, client.get_table(table_ref))
+        return "".join(chunks)
+
+    # Skip other types (MATERIALIZED VIEW, SNAPSHOT, etc.)
+    return ""
 
 
 def _append_external_iceberg_ddl_if_applicable(
-    ddl_chunks: List[str], table_obj: bigquery.Table
+    ddl_chunks: list[str], table_obj: bigquery.Table
 ) -> None:
     cfg = table_obj.external_data_configuration
     if not (cfg and cfg.source_format == "ICEBERG"):
         return
 
-    uris_list_str = ",\n    ".join("'{}'".format(uri) for uri in cfg.source_uris)
-    col_defs: List[str] = []
+    uris_list_str = ",\n    ".join(["'{}'".format(uri) for uri in cfg.source_uris])
+    col_defs: list[str] = []
     for field in table_obj.schema:
         col_type = "ARRAY<{}>".format(field.field_type) if field.mode == "REPEATED" else field.field_type
         col_defs.append("  `{}` {}".format(field.name, col_type))
@@ -173,65 +435,124 @@ def _append_external_iceberg_ddl_if_applicable(
     )
 
 
-def _ddl_for_table_with_samples(client: bigquery.Client, table_obj: bigquery.Table) -> str:
-    # Column definitions with descriptions (avoid backslashes in f-expressions)
-    cols: List[str] = []
-    for field in table_obj.schema:
-        col_type = "ARRAY<{}>".format(field.field_type) if field.mode == "REPEATED" else field.field_type
-        col_def = "  `{}` {}".format(field.name, col_type)
-        if field.description:
-            safe_desc = str(field.description).replace("'", "''")
+def _schema_fields_from_columns(columns: list[tuple]) -> Optional[list[bigquery.SchemaField]]:
+    """SchemaFields for INFORMATION_SCHEMA columns; None (let the client fetch it) for STRUCTs."""
+    from google.cloud import bigquery
+
+    fields: list[bigquery.SchemaField] = []
+    for name, data_type, _ in columns:
+        mode = "NULLABLE"
+        if data_type.startswith("ARRAY<") and data_type.endswith(">"):
+            mode, data_type = "REPEATED", data_type[6:-1]
+        if "<" in data_type:
+            return None
+        # Drop type parameters, e.g. STRING(10) / NUMERIC(10, 2).
+        fields.append(bigquery.SchemaField(name, data_type.split("(", 1)[0], mode=mode))
+    return fields or None
+
+
+def _table_ddl_header(table_ref: bigquery.TableReference, columns: list[tuple]) -> str:
+    # Column definitions with descriptions (avoid backslashes in f-expressions);
+    # data_type is already the full GoogleSQL type, e.g. ARRAY<STRING>.
+    cols: list[str] = []
+    for name, data_type, description in columns:
+        col_def = "  `{}` {}".format(name, data_type)
+        if description:
+            safe_desc = str(description).replace("'", "''")
             col_def += " OPTIONS(description='{}')".format(safe_desc)
         cols.append(col_def)
 
     cols_joined = ",\n".join(cols)
-    ddl = "CREATE OR REPLACE TABLE `{}` (\n{}\n);\n\n".format(table_obj.reference, cols_joined)
+    return "CREATE OR REPLACE TABLE `{}` (\n{}\n);\n\n".format(table_ref, cols_joined)
+
+
+def _ddl_for_table_with_samples(
+    client: bigquery.Client, table_ref: bigquery.TableReference, columns: list[tuple]
+) -> str:
+    # Chunks joined once at the end rather than repeated `ddl +=` copies.
+    parts: list[str] = [_table_ddl_header(table_ref, columns)]
 
     # Sample rows (best-effort)
     try:
-        sample_query = "SELECT * FROM `{}` LIMIT 5".format(table_obj.reference)
-        LOGGER.debug("Sampling query: %s", sample_query)
-        df = client.query(sample_query).to_dataframe()
-        if not df.empty:
-            ddl += "-- Example values for table `{}`:\n".format(table_obj.reference)
-            for _, r in df.iterrows():
-                values_str = ", ".join(_serialize_value_for_sql(v) for v in r.values)
-                ddl += "INSERT INTO `{}` VALUES ({});\n".format(table_obj.reference, values_str)
-        ddl += "\n"
+        # Read the first rows straight from table storage (tabledata.list): no query job
+        # to schedule, and unlike `SELECT * ... LIMIT 5` it bills no bytes scanned.
+        # Batching tables into one UNION ALL query would trade these free, parallel
+        # reads for a job that bills a full scan of every table in the batch.
+        LOGGER.debug("Sampling rows: %s", table_ref)
+        # With selected_fields, list_rows skips its implicit get_table() for the schema.
+        rows = list(
+            client.list_rows(
+                table_ref,
+                max_results=SAMPLE_ROWS,
+                selected_fields=_schema_fields_from_columns(columns),
+            )
+        )
+        if rows:
+            parts.append("-- Example values for table `{}`:\n".format(table_ref))
+            for r in rows:
+                values_str = ", ".join(map(_serialize_value_for_sql, r.values()))
+                parts.append("INSERT INTO `{}` VALUES ({});\n".format(table_ref, values_str))
+        parts.append("\n")
     except Exception as exc:  # noqa: BLE001
-        LOGGER.warning("Sample retrieval failed for %s: %s", table_obj.reference.path, exc)
-        ddl += "-- NOTE: Could not retrieve sample rows for table {}.\n\n".format(table_obj.reference.path)
+        LOGGER.warning("Sample retrieval failed for %s: %s", table_ref.path, exc)
+        parts.append("{} {}.\n\n".format(_SAMPLE_FAILED_NOTE, table_ref.path))
 
-    return ddl
+    return "".join(parts)
 
 
 # ==============================================================================
 # NL2SQL generation
 # ==============================================================================
+_NL2SQL_PROMPT_PREFIX = (
+    "You are a BigQuery SQL expert. Given the schema and a natural-language question, "
+    "produce a valid GoogleSQL query that answers the request.\n\n"
+    "Rules:\n"
+    "- Use fully-qualified table names with backticks: `project.dataset.table`.\n"
+    "- Minimize joins; ensure join column types match.\n"
+    "- Every non-aggregated SELECT column must appear in GROUP BY.\n"
+    "- Use valid GoogleSQL; alias with AS; wrap subqueries/UNIONs in parentheses.\n"
+    "- Only use columns present in the provided schema under their correct tables.\n"
+    "- Apply sensible WHERE/HAVING filters.\n"
+    "- Cap results to < {max_rows} rows (add LIMIT if needed).\n\n"
+    "Schema (tables with samples):\n{schema}\n\n"
+    "User question:\n"
+)
+_NL2SQL_PROMPT_SUFFIX = "\n\nReturn only the SQL."
+
+
+@functools.lru_cache(maxsize=4)
+def _build_nl2sql_prefix(ddl_schema: str) -> str:
+    """Everything before the question; stable for a given schema snapshot.
+
+    Memoized (str hashes are cached on the object) so sessions without a stored
+    prefix, and TTL refreshes of an unchanged schema, format the template only once.
+    """
+    return _NL2SQL_PROMPT_PREFIX.format(max_rows=MAX_NUM_ROWS, schema=ddl_schema)
+
+
+def _nl2sql_cache_get(key: tuple) -> Optional[str]:
+    with _nl2sql_cache_lock:
+        sql = _nl2sql_cache.get(key)
+        if sql is not None:
+            _nl2sql_cache.move_to_end(key)
+        return sql
+
+
+def _nl2sql_cache_put(key: tuple, sql: str) -> None:
+    with _nl2sql_cache_lock:
+        _nl2sql_cache[key] = sql
+        _nl2sql_cache.move_to_end(key)
+        while len(_nl2sql_cache) > NL2SQL_CACHE_MAXSIZE:
+            _nl2sql_cache.popitem(last=False)
+
+
 def initial_bq_nl2sql(question: str, tool_context: ToolContext) -> str:
     """Generate an initial SQL query from a natural language question."""
     LOGGER.info("NL2SQL: building prompt for question")
-    ddl_schema = tool_context.state["database_settings"]["bq_ddl_schema"]
-
-    prompt_template = (
-        "You are a BigQuery SQL expert. Given the schema and a natural-language question, "
-        "produce a valid GoogleSQL query that answers the request.\n\n"
-        "Rules:\n"
-        "- Use fully-qualified table names with backticks: `project.dataset.table`.\n"
-        "- Minimize joins; ensure join column types match.\n"
-        "- Every non-aggregated SELECT column must appear in GROUP BY.\n"
-        "- Use valid GoogleSQL; alias with AS; wrap subqueries/UNIONs in parentheses.\n"
-        "- Only use columns present in the provided schema under their correct tables.\n"
-        "- Apply sensible WHERE/HAVING filters.\n"
-        "- Cap results to < {max_rows} rows (add LIMIT if needed).\n\n"
-        "Schema (tables with samples):\n{schema}\n\n"
-        "User question:\n{question}\n\n"
-        "Return only the SQL."
-    )
-
-    prompt = prompt_template.format(
-        max_rows=MAX_NUM_ROWS, schema=ddl_schema, question=question
-    )
+    settings = tool_context.state["database_settings"]
+    # Sessions created before the prefix existed only carry the raw schema.
+    prefix = settings.get("_nl2sql_prefix") or _build_nl2sql_prefix(settings["bq_ddl_schema"])
+    prompt = prefix + question + _NL2SQL_PROMPT_SUFFIX
 
     model_name = (
         os.getenv("BASELINE_NL2SQL_MODEL")
@@ -239,19 +560,28 @@ def initial_bq_nl2sql(question: str, tool_context: ToolContext) -> str:
         or "gemini-1.5-flash-002"
     )
 
-    LOGGER.info("NL2SQL: generating with model=%s", model_name)
-    t0 = time.time()
-    resp = get_llm_client().models.generate_content(
-        model=model_name,
-        contents=prompt,
-        config={"temperature": 0.1},
-    )
-    elapsed_ms = (time.time() - t0) * 1000.0
-    LOGGER.info("NL2SQL generation completed in %.1f ms", elapsed_ms)
-
-    sql = (resp.text or "").strip()
-    sql = sql.replace("```sql", "").replace("```", "").strip()
-    LOGGER.debug("NL2SQL draft (first 200 chars): %s", sql[:200])
+    # Same prompt (question + schema snapshot) against the same model -> reuse the draft.
+    cache_key = (hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest(), model_name)
+    sql = None if NL2SQL_CACHE_DISABLED else _nl2sql_cache_get(cache_key)
+    if sql is not None:
+        LOGGER.info("NL2SQL: cache hit")
+    else:
+        LOGGER.info("NL2SQL: generating with model=%s", model_name)
+        t0 = time.perf_counter_ns()
+        resp = get_llm_client().models.generate_content(
+            model=model_name,
+            contents=prompt,
+            config={"temperature": 0.1},
+        )
+        elapsed_ms = (time.perf_counter_ns() - t0) // 1_000_000
+        LOGGER.info("NL2SQL generation completed in %d ms", elapsed_ms)
+
+        sql = (resp.text or "").strip()
+        sql = sql.replace("```sql", "").replace("```", "").strip()
+        if sql and not NL2SQL_CACHE_DISABLED:
+            _nl2sql_cache_put(cache_key, sql)
+    if LOGGER.isEnabledFor(logging.DEBUG):  # skip the slice copy unless it will be logged
+        LOGGER.debug("NL2SQL draft (first 200 chars): %s", sql[:200])
 
     tool_context.state["sql_query"] = sql
     return sql
@@ -260,7 +590,43 @@ def initial_bq_nl2sql(question: str, tool_context: ToolContext) -> str:
 # ==============================================================================
 # Validation
 # ==============================================================================
-def run_bigquery_validation(sql_string: str, tool_context: ToolContext) -> Dict[str, Any]:
+@functools.cache
+def _dry_run_config() -> bigquery.QueryJobConfig:
+    from google.cloud import bigquery
+
+    return bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+
+
+@functools.cache
+def _validation_query_config() -> bigquery.QueryJobConfig:
+    from google.cloud import bigquery
+
+    return bigquery.QueryJobConfig(maximum_bytes_billed=MAX_BILLED_BYTES)
+
+
+def _contains_disallowed_dml(sql: str) -> bool:
+    lowered = sql.lower()
+    # C-level substring prefilter: typical read-only SQL contains none of the keywords,
+    # so the token scan only runs on candidates (e.g. a column named `updated_at`).
+    if not any(keyword in lowered for keyword in DISALLOWED_DML_KEYWORDS):
+        return False
+    return any(m.group() in DISALLOWED_DML_KEYWORDS for m in _WORD_RE.finditer(lowered))
+
+
+def _unescape(match: re.Match) -> str:
+    return _ESCAPE_MAP[match.group(1)]
+
+
+def _cleanup_sql(raw: str) -> str:
+    """Normalize escapes/newlines and ensure a LIMIT exists."""
+    # Most drafts carry no escapes at all; the membership test skips the regex pass.
+    s = (_ESCAPE_RE.sub(_unescape, raw) if "\\" in raw else raw).strip()
+    if not _HAS_LIMIT_RE.search(s):
+        s = s + " limit " + str(MAX_NUM_ROWS)
+    return s
+
+
+def run_bigquery_validation(sql_string: str, tool_context: ToolContext) -> dict[str, Any]:
     """
     Validate a BigQuery query by executing it (read-only) and summarizing the outcome.
 
@@ -273,30 +639,38 @@ def run_bigquery_validation(sql_string: str, tool_context: ToolContext) -> Dict[
     LOGGER.info("Validation: starting")
     LOGGER.debug("Validation: original SQL:\n%s", sql_string)
 
-    def cleanup_sql(raw: str) -> str:
-        """Normalize escapes/newlines and ensure a LIMIT exists."""
-        s = raw.replace('\\"', '"')
-        s = s.replace("\\\n", "\n")
-        s = s.replace("\\'", "'")
-        s = s.replace("\\n", "\n").strip()
-        if "limit" not in s.lower():
-            s = s + " limit " + str(MAX_NUM_ROWS)
-        return s
-
-    final_result: Dict[str, Any] = {"query_result": None, "error_message": None}
+    final_result: dict[str, Any] = {"query_result": None, "error_message": None}
 
     # Block DML/DDL to enforce read-only validation
-    if DISALLOWED_DML_RE.search(sql_string or ""):
+    if _contains_disallowed_dml(sql_string or ""):
         msg = "Invalid SQL: Contains disallowed DML/DDL operations."
         final_result["error_message"] = msg
         LOGGER.warning(msg)
         return final_result
 
-    cleaned_sql = cleanup_sql(sql_string or "")
+    cleaned_sql = _cleanup_sql(sql_string or "")
     LOGGER.debug("Validation: cleaned SQL:\n%s", cleaned_sql)
 
     try:
-        results = get_bq_client().query(cleaned_sql).result()
+        client = get_bq_client()
+        if DRY_RUN_ENABLED:
+            # Free planning pass: syntax/semantic errors and the scan estimate come back
+            # without executing (or billing) the query.
+            dry_job = client.query(cleaned_sql, job_config=_dry_run_config())
+            scanned = dry_job.total_bytes_processed or 0
+            if scanned > MAX_SCAN_BYTES:
+                final_result["error_message"] = (
+                    f"Invalid SQL: query would scan {scanned} bytes "
+                    f"(limit {MAX_SCAN_BYTES}); add filters or select fewer columns."
+                )
+                LOGGER.warning("Validation: refused, dry run scans %d bytes", scanned)
+                return final_result
+
+        # max_results/page_size cap the rows shipped to one page of the summary size;
+        # maximum_bytes_billed makes BigQuery itself reject runaway scans.
+        results = client.query(cleaned_sql, job_config=_validation_query_config()).result(
+            max_results=MAX_NUM_ROWS, page_size=MAX_NUM_ROWS
+        )
         LOGGER.info("Validation: query executed")
 
         rows = _format_bq_rows(results, MAX_NUM_ROWS) if results.schema else []
@@ -318,42 +692,90 @@ def run_bigquery_validation(sql_string: str, tool_context: ToolContext) -> Dict[
     return final_result
 
 
-def _format_bq_rows(results: bigquery.table.RowIterator, max_rows: int) -> List[Dict[str, Any]]:
+def _format_bq_rows(results: bigquery.table.RowIterator, max_rows: int) -> list[dict[str, Any]]:
     """Convert BQ results to JSON-serializable rows (date-friendly)."""
-    out: List[Dict[str, Any]] = []
-    for row in results:
-        converted: Dict[str, Any] = {}
-        for key, value in row.items():
-            if isinstance(value, datetime.date):
-                converted[key] = value.strftime("%Y-%m-%d")
-            else:
-                converted[key] = value
-        out.append(converted)
-        if len(out) >= max_rows:
-            break
-    return out
+    convert = _row_converter(tuple((f.name, f.field_type, f.mode) for f in results.schema))
+    # islice keeps the cap for iterators fetched without max_results; no per-row len() check.
+    return [convert(row.values()) for row in itertools.islice(results, max_rows)]
+
+
+@functools.lru_cache(maxsize=64)
+def _row_converter(schema_key: tuple) -> Callable[[tuple], dict[str, Any]]:
+    """Build (once per schema) a row-tuple -> dict converter with date columns pre-resolved."""
+    names = tuple(name for name, _, _ in schema_key)
+    # (index, formatter, repeated) per date-typed column; DATE values take the C-level
+    # isoformat(), DATETIME/TIMESTAMP keep the date-only strftime.
+    date_cols = tuple(
+        (i, datetime.date.isoformat if field_type == "DATE" else _format_date_only, mode == "REPEATED")
+        for i, (_, field_type, mode) in enumerate(schema_key)
+        if field_type in _DATE_FIELD_TYPES
+    )
+
+    if not date_cols:
+        return lambda values: dict(zip(names, values, strict=True))
+
+    def convert(values: tuple) -> dict[str, Any]:
+        converted = dict(zip(names, values, strict=True))
+        for i, fmt, repeated in date_cols:
+            v = values[i]
+            if v is None:
+                continue
+            converted[names[i]] = [fmt(x) for x in v if x is not None] if repeated else fmt(v)
+        return converted
+
+    return convert
+
+
+def _format_date_only(value: datetime.date) -> str:
+    return value.strftime("%Y-%m-%d")
 
 
 # ==============================================================================
 # Serialization helper for sample DDL inserts
 # ==============================================================================
 def _serialize_value_for_sql(value: Any) -> str:
-    """Serialize a Python value from pandas into a BigQuery SQL literal."""
-    if pd.isna(value):
+    """Serialize a Python value from a BigQuery row into a BigQuery SQL literal."""
+    # Exact-type dispatch covers the scalars BigQuery rows normally carry in one dict lookup.
+    formatter = _SQL_LITERAL_FORMATTERS.get(type(value))
+    if formatter is not None:
+        return formatter(value)
+    # Fallback for subclasses/array-likes. Containers first so the NULL/NaN test
+    # only ever sees scalars. Duck-typed so pandas/numpy never need importing: numpy
+    # arrays expose ndim > 0 (which excludes numpy scalars).
+    if isinstance(value, (list, tuple)) or getattr(value, "ndim", 0) > 0:
+        return _sql_list_literal(value)
+    if isinstance(value, dict):
+        return _sql_struct_literal(value)
+    if value is None or (isinstance(value, float) and math.isnan(value)):
         return "NULL"
     if isinstance(value, str):
         # Escape backslashes and single quotes
-        s = value.replace("\\", "\\\\").replace("'", "''")
-        return "'" + s + "'"
+        return f"'{value.translate(_SQL_STR_TRANS)}'"
     if isinstance(value, bytes):
-        s = value.decode("utf-8", "replace").replace("\\", "\\\\").replace("'", "''")
-        return "b'" + s + "'"
-    if isinstance(value, (datetime.datetime, datetime.date, pd.Timestamp)):
+        return f"b'{value.decode('utf-8', 'replace').translate(_SQL_STR_TRANS)}'"
+    # pd.Timestamp subclasses datetime.
+    if isinstance(value, _DATETIME_TYPES):
         return "'" + str(value) + "'"
-    if isinstance(value, (list, np.ndarray)):
-        inner = ", ".join(_serialize_value_for_sql(v) for v in value)
-        return "[" + inner + "]"
-    if isinstance(value, dict):
-        inner = ", ".join(_serialize_value_for_sql(v) for v in value.values())
-        return "(" + inner + ")"
-    return str(value)
\ No newline at end of file
+    return str(value)
+
+
+def _sql_list_literal(value: list) -> str:
+    return "[" + ", ".join([_serialize_value_for_sql(v) for v in value]) + "]"
+
+
+def _sql_struct_literal(value: dict) -> str:
+    return "(" + ", ".join([_serialize_value_for_sql(v) for v in value.values()]) + ")"
+
+
+_SQL_LITERAL_FORMATTERS: dict[type, Callable[[Any], str]] = {
+    type(None): lambda v: "NULL",
+    bool: str,
+    int: str,
+    float: lambda v: "NULL" if math.isnan(v) else str(v),
+    str: lambda v: f"'{v.translate(_SQL_STR_TRANS)}'",
+    bytes: lambda v: f"b'{v.decode('utf-8', 'replace').translate(_SQL_STR_TRANS)}'",
+    datetime.date: lambda v: f"'{v}'",
+    datetime.datetime: lambda v: f"'{v}'",
+    list: _sql_list_literal,
+    dict: _sql_struct_literal,
+}
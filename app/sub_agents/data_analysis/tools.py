@@ -3,11 +3,24 @@
 -- then, it use NL2Py to do further data analysis as needed
 """
 
+import logging
+import os
+
+import orjson
 from google.adk.tools import ToolContext
 from google.adk.tools.agent_tool import AgentTool
 
 from .sub_agents import data_analyzer_agent, db_query_agent
 
+LOGGER = logging.getLogger(__name__)
+
+# Upper bound on the serialized rows embedded in the analyzer prompt.
+MAX_ANALYSIS_BYTES = int(os.getenv("MAX_ANALYSIS_BYTES", "262144"))
+
+# AgentTool only wraps the agent; built once and shared by every call.
+_DB_AGENT_TOOL = AgentTool(agent=db_query_agent)
+_DA_AGENT_TOOL = AgentTool(agent=data_analyzer_agent)
+
 
 async def call_db_query_agent(
     question: str,
@@ -15,21 +28,18 @@ async def call_db_query_agent(
 ):
     """Tool to call database (natural language to SQL) agent."""
 
-    print("db agent called with question = " + question)
-
-    print(
-        "\n call_db_query_agent.use_database:"
-        f' {tool_context.state["all_db_settings"]["use_database"]}'
+    LOGGER.debug(
+        "db agent called with question=%s use_database=%s",
+        question,
+        tool_context.state["all_db_settings"]["use_database"],
     )
 
-    agent_tool = AgentTool(agent=db_query_agent)
-
-    db_query_agent_output = await agent_tool.run_async(
+    db_query_agent_output = await _DB_AGENT_TOOL.run_async(
         args={"request": question}, tool_context=tool_context
     )
 
     tool_context.state["db_query_agent_output"] = db_query_agent_output
-    print("db agent output = " + db_query_agent_output)
+    LOGGER.debug("db agent output=%s", db_query_agent_output)
     return db_query_agent_output
 
 
@@ -41,12 +51,11 @@ async def call_data_analyzer_agent(
 
     # Fast path: DS agent not needed, just echo DB output.
     if question == "N/A":
-        print("question is NA, using db agent output")
         db_out = tool_context.state.get("db_query_agent_output", "")
-        print("using this db agent output = " + str(db_out))
+        LOGGER.debug("question is N/A, using db agent output=%s", db_out)
         return db_out
 
-    print("question is not na = " + question)
+    LOGGER.debug("data analyzer called with question=%s", question)
 
     # SAFELY read query_result from state (may be absent or empty)
     input_data = tool_context.state.get("query_result")
@@ -60,7 +69,7 @@ async def call_data_analyzer_agent(
             "This typically happens if the DB validation/query step did not run "
             "or returned no data. Skipping Python analysis."
         )
-        print(msg)
+        LOGGER.info(msg)
         # Prefer returning something useful to the caller (e.g., DB agent output)
         return db_out or msg
 
@@ -71,21 +80,52 @@ async def call_data_analyzer_agent(
             "Query executed successfully but returned 0 rows. "
             "Skipping Python analysis."
         )
-        print(msg)
+        LOGGER.info(msg)
         return db_out or msg
 
+    rows_json = _rows_to_json(input_data)
     question_with_data = f"""
   Question to answer: {question}
 
   Actual data to analyze for the previous question is below (JSON-like rows):
-  {input_data}
+  {rows_json}
   """
 
-    agent_tool = AgentTool(agent=data_analyzer_agent)
-    data_analyzer_agent_output = await agent_tool.run_async(
+    data_analyzer_agent_output = await _DA_AGENT_TOOL.run_async(
         args={"request": question_with_data}, tool_context=tool_context
     )
     tool_context.state["data_analyzer_agent_output"] = data_analyzer_agent_output
 
-    print("da agent output = " + str(data_analyzer_agent_output))
+    LOGGER.debug("da agent output=%s", data_analyzer_agent_output)
     return data_analyzer_agent_output
+
+
+def _compact_json(rows) -> bytes:
+    return orjson.dumps(rows, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _rows_to_json(rows) -> str:
+    """Compact JSON for the analyzer prompt, truncated to MAX_ANALYSIS_BYTES (UTF-8).
+
+    JSON (not the Python repr) is what the analyzer parses most reliably; values
+    orjson can't encode (Decimal, time, ...) fall back to str().
+    """
+    payload = _compact_json(rows)
+    if len(payload) <= MAX_ANALYSIS_BYTES:
+        return payload.decode("utf-8")
+
+    notes = []
+    if isinstance(rows, list) and len(rows) > 1:
+        total = len(rows)
+        # Halve until the slice fits; a few dumps of shrinking slices, never the full repr.
+        while len(rows) > 1 and len(payload) > MAX_ANALYSIS_BYTES:
+            rows = rows[: len(rows) // 2]
+            payload = _compact_json(rows)
+        notes.append(f"truncated to the first {len(rows)} of {total} rows")
+    if len(payload) > MAX_ANALYSIS_BYTES:
+        # A single row (or non-list result) is still over budget: cut the text itself.
+        payload = payload[:MAX_ANALYSIS_BYTES]
+        notes.append(f"cut to the first {MAX_ANALYSIS_BYTES} bytes, so the JSON is incomplete")
+    note = "; ".join(notes)
+    LOGGER.info("Analyzer input %s", note)
+    return f"{payload.decode('utf-8', errors='ignore')}\n  (Note: {note}.)"
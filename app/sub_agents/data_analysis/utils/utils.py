@@ -13,8 +13,7 @@ def get_env_var(var_name):
     Raises:
       ValueError: If the variable is missing.
     """
-    try:
-        val = os.environ[var_name]
-        return val
-    except KeyError:
-        raise ValueError(f"Missing environment variable: {var_name}")
\ No newline at end of file
+    val = os.environ.get(var_name)
+    if val is None:
+        raise ValueError(f"Missing environment variable: {var_name}")
+    return val
@@ -1,7 +1,7 @@
 import os
 from datetime import date
-from google.genai import types
 from google.adk.agents import Agent
+from ...utils.generation import GEN_CFG_LOW
 from .prompts import return_instructions_resource_agent
 from .tools import ALL_RESOURCE_TOOLS
 
@@ -15,5 +15,5 @@ resource_agent = Agent(
     model=os.getenv("ADVANCED_MODEL"),
     instruction=return_instructions_resource_agent(resource_project_id=project, resource_project_location=location),
     tools=ALL_RESOURCE_TOOLS,
-    generate_content_config=types.GenerateContentConfig(temperature=0.01),
+    generate_content_config=GEN_CFG_LOW,
 )
\ No newline at end of file
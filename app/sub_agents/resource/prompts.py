@@ -72,8 +72,9 @@ Return **only** a JSON object shaped like:
 
 ## 2) Firestore Document Tools (direct CRUD)
 - `fs_create_document(collection: str, document: dict, document_id?: str) -> dict`
-- `fs_get_document(collection: str, document_id: str) -> dict`
-- `fs_get_all_documents(collection: str, include_ids?: bool) -> dict`
+- `fs_bulk_create_documents(collection: str, documents: list[dict], document_ids?: list[str]) -> dict` (use instead of repeated `fs_create_document` when creating several documents)
+- `fs_get_document(collection: str, document_id: str, fields?: list[str]) -> dict`
+- `fs_get_all_documents(collection: str, include_ids?: bool, document_ids?: list[str], fields?: list[str]) -> dict` (pass `document_ids` to fetch only those documents, `fields` to return only the fields you need)
 - `fs_update_document(collection: str, document_id: str, new_document: dict) -> dict`
 - `fs_update_document_field(collection: str, document_id: str, field_name: str, new_value: Any) -> dict`
 - `fs_delete_document(collection: str, document_id: str) -> dict`
@@ -86,6 +87,11 @@ Return **only** a JSON object shaped like:
   - Before create: optionally read first; if it exists and data matches intent, return `"already_exists"`.
   - Before update/delete: verify target exists; if missing, return a clear error and do not create implicitly.
 
+## 3) describe_schema
+- `describe_schema(collection: str) -> dict`
+
+**When**: the request asks for a collection's schema (e.g. "describe_schema for collection budgets"), or before creating/updating a document in a known collection so the payload has every required field. Return the schema under `"data"`.
+
 # Safety & Idempotency
 - **Create/Update**: check current state first (via CLI for DB, via `fs_get_document` for docs).
 - **Delete**: require explicit confirmation; if not present, return error asking for confirmation.
@@ -0,0 +1,77 @@
+"""
+Firestore collection schemas served on demand through the `describe_schema` tool,
+so they do not have to be carried in every root-agent prompt.
+"""
+from typing import Any
+
+COLLECTION_SCHEMAS: dict[str, dict[str, Any]] = {
+    "budgets": {
+        "document_id_field": "budget_id",
+        "required": {
+            "budget_id": "uuid — document ID",
+            "name": "string",
+            "currency": 'string, e.g. "USD"',
+            "period_start": "ISO8601",
+            "period_end": "ISO8601",
+            "status": "string: planned|active|paused|closed",
+            "initial_amount": "integer — total starting budget",
+            "amount_left": "integer — externally updated",
+            "daily_cost": "integer — chosen from the platform daily cost defaults",
+        },
+        "optional": {
+            "notes": "string",
+        },
+    },
+    "promotions": {
+        "document_id_field": "promotion_id",
+        "notes": "Budgets must already exist; include at least one budget_id.",
+        "required": {
+            "promotion_id": "uuid — document ID",
+            "name": "string",
+            "status": "string: draft|scheduled|active|paused|ended|cancelled",
+            "discount_type": "string: percent|amount",
+            "discount_value": "number",
+            "start_at": "ISO8601",
+            "end_at": "ISO8601",
+            "budget_ids": "array<string> — reference one or more budget documents",
+        },
+        "optional": {
+            "channels": "array<string>",
+            "promo_code": "string|null",
+            "description": "string",
+            "notes": "string",
+        },
+    },
+    "campaigns": {
+        "document_id_field": "campaign_id",
+        "notes": "Budgets must already exist; include at least one budget_id.",
+        "required": {
+            "campaign_id": "uuid — document ID",
+            "name": "string",
+            "status": "string: draft|scheduled|active|paused|ended|cancelled",
+            "objective": "string: acquisition|retention|winback|awareness",
+            "start_at": "ISO8601",
+            "end_at": "ISO8601",
+            "budget_ids": "array<string> — reference one or more budget documents",
+        },
+        "optional": {
+            "channels": "array<string>",
+            "linked_promotions": "array<string> — promotion_ids this campaign activates",
+            "description": "string",
+            "notes": "string",
+        },
+    },
+    "audience_groups": {
+        "document_id_field": "group_id",
+        "required": {
+            "group_id": "uuid — document ID",
+            "name": "string",
+            "criteria": "object — concise definition of how the group is built (e.g., SQL filter description, rules)",
+            "created_at": "ISO8601",
+        },
+        "optional": {
+            "size_estimate": "integer",
+            "notes": "string",
+        },
+    },
+}
@@ -1,38 +1,88 @@
-from typing import Any, Dict, Optional, List
+import asyncio
+from typing import Any, Optional
 import json
 
 from google.adk.tools import FunctionTool, ToolContext
 from google.adk.tools.agent_tool import AgentTool
 from .. import cli_agent
+from .schemas import COLLECTION_SCHEMAS
 
 from .utils.firestore.dao import (
+    BulkWriteError,
     create_document as _create_document,
+    bulk_create_documents as _bulk_create_documents,
     get_document as _get_document,
     update_document as _update_document,
     delete_document as _delete_document,
     update_document_field as _update_document_field,
-    get_all_documents as _get_all_documents
+    get_all_documents as _get_all_documents,
+    get_documents_by_ids as _get_documents_by_ids,
 )
 
-def fs_create_document(
+
+# The DAO calls are blocking gRPC; running them in a worker thread keeps the event
+# loop free so other tool calls and sessions progress meanwhile.
+async def fs_create_document(
     collection: str,
-    document: Dict[str, Any],
+    document: dict[str, Any],
     document_id: Optional[str] = None,
-) -> Dict[str, Any]:
+) -> dict[str, Any]:
     try:
-        new_id = _create_document(collection=collection, document=document, document_id=document_id)
+        new_id = await asyncio.to_thread(
+            _create_document, collection=collection, document=document, document_id=document_id
+        )
         return {"status": "success", "document_id": new_id}
     except Exception as e:
         return {"status": "error", "error_message": str(e)}
 
+
 fs_create_document_tool = FunctionTool(func=fs_create_document)
 
-def fs_get_document(
+
+async def fs_bulk_create_documents(
+    collection: str,
+    documents: list[dict[str, Any]],
+    document_ids: Optional[list[str]] = None,
+) -> dict[str, Any]:
+    """
+    Create many documents in one collection with batched writes.
+
+    Args:
+      collection: Firestore collection name.
+      documents: List of documents to create.
+      document_ids: Optional IDs aligned with `documents`; omitted entries are auto-generated.
+    """
+    try:
+        new_ids = await asyncio.to_thread(
+            _bulk_create_documents,
+            collection=collection,
+            documents=documents,
+            document_ids=document_ids,
+        )
+        return {"status": "success", "document_ids": new_ids}
+    except BulkWriteError as e:
+        return {
+            "status": "error",
+            "document_ids": e.created_ids,
+            "failed_ids": e.failed_ids,
+            "error_message": str(e),
+        }
+    except Exception as e:
+        return {"status": "error", "document_ids": [], "error_message": str(e)}
+
+
+fs_bulk_create_documents_tool = FunctionTool(func=fs_bulk_create_documents)
+
+
+async def fs_get_document(
     collection: str,
     document_id: str,
-) -> Dict[str, Any]:
+    fields: Optional[list[str]] = None,
+) -> dict[str, Any]:
     try:
-        doc = _get_document(collection=collection, document_id=document_id)
+        doc = await asyncio.to_thread(
+            _get_document, collection=collection, document_id=document_id, fields=fields
+        )
         return {
             "status": "success",
             "found": doc is not None,
@@ -41,59 +91,98 @@ def fs_get_document(
     except Exception as e:
         return {"status": "error", "found": False, "document": None, "error_message": str(e)}
 
+
 fs_get_document_tool = FunctionTool(func=fs_get_document)
 
-def fs_get_all_documents(
+
+async def fs_get_all_documents(
     collection: str,
     include_ids: bool = True,
-) -> Dict[str, Any]:
+    document_ids: Optional[list[str]] = None,
+    fields: Optional[list[str]] = None,
+) -> dict[str, Any]:
     """
-    Retrieve all documents in a collection.
+    Retrieve all documents in a collection, or only the given document IDs.
 
     Args:
       collection: Firestore collection name.
       include_ids: If True, include each document's ID under key 'id'.
+      document_ids: Optional list of IDs; when given, only these documents are
+                    fetched (in one batched read) instead of the whole collection.
+      fields: Optional list of field names; when given, only these fields are
+              returned for each document.
     """
     try:
-        docs = _get_all_documents(collection=collection, include_ids=include_ids)
+        if document_ids:
+            docs = await asyncio.to_thread(
+                _get_documents_by_ids,
+                collection=collection,
+                document_ids=document_ids,
+                include_ids=include_ids,
+                fields=fields,
+            )
+        else:
+            docs = await asyncio.to_thread(
+                _get_all_documents, collection=collection, include_ids=include_ids, fields=fields
+            )
         return {"status": "success", "documents": docs}
     except Exception as e:
         return {"status": "error", "documents": [], "error_message": str(e)}
 
+
 fs_get_all_documents_tool = FunctionTool(func=fs_get_all_documents)
 
-def fs_update_document(
+
+async def fs_update_document(
     collection: str,
     document_id: str,
-    new_document: Dict[str, Any],
-) -> Dict[str, Any]:
+    new_document: dict[str, Any],
+) -> dict[str, Any]:
     try:
-        _update_document(collection=collection, document_id=document_id, new_document=new_document)
+        await asyncio.to_thread(
+            _update_document,
+            collection=collection,
+            document_id=document_id,
+            new_document=new_document,
+        )
         return {"status": "success", "document_id": document_id}
     except Exception as e:
         return {"status": "error", "document_id": document_id, "error_message": str(e)}
 
+
 fs_update_document_tool = FunctionTool(func=fs_update_document)
 
-def fs_update_document_field(
+# First characters of any JSON value json.loads accepts (incl. NaN / Infinity).
+_JSON_START_CHARS = frozenset('{["-0123456789tfnNI')
+
+
+async def fs_update_document_field(
     collection: str,
     document_id: str,
     field_name: str,
     new_value: str,
-) -> Dict[str, Any]:
+) -> dict[str, Any]:
     """
     Updates a single field on a Firestore document.
 
     new_value must be JSON-encoded (e.g., "42", "true", "\"Amsterdam\"", "{\"nested\":1}").
-    If parsing fails, the raw string is used.
+    If parsing fails, the raw string is used; an already-decoded value is used as-is.
     """
     try:
-        try:
-            parsed_value = json.loads(new_value)
-        except Exception:
+        # Only text starting like a JSON value can parse; plain strings such as
+        # Amsterdam skip the parser and its exception path entirely.
+        if not isinstance(new_value, str):
+            parsed_value = new_value
+        elif new_value.lstrip()[:1] in _JSON_START_CHARS:
+            try:
+                parsed_value = json.loads(new_value)
+            except Exception:
+                parsed_value = new_value
+        else:
             parsed_value = new_value
 
-        _update_document_field(
+        await asyncio.to_thread(
+            _update_document_field,
             collection=collection,
             document_id=document_id,
             field_name=field_name,
@@ -112,20 +201,46 @@ def fs_update_document_field(
             "error_message": str(e),
         }
 
+
 fs_update_document_field_tool = FunctionTool(func=fs_update_document_field)
 
-def fs_delete_document(
+
+async def fs_delete_document(
     collection: str,
     document_id: str,
-) -> Dict[str, Any]:
+) -> dict[str, Any]:
     try:
-        _delete_document(collection=collection, document_id=document_id)
+        await asyncio.to_thread(_delete_document, collection=collection, document_id=document_id)
         return {"status": "success", "document_id": document_id}
     except Exception as e:
         return {"status": "error", "document_id": document_id, "error_message": str(e)}
 
+
 fs_delete_document_tool = FunctionTool(func=fs_delete_document)
 
+
+def describe_schema(collection: str) -> dict[str, Any]:
+    """
+    Return the field schema (required/optional fields) for a Firestore collection.
+
+    Args:
+      collection: One of the known collections, e.g. "budgets", "promotions",
+                  "campaigns", "audience_groups".
+    """
+    schema = COLLECTION_SCHEMAS.get(collection)
+    if schema is None:
+        return {
+            "status": "error",
+            "error_message": f"Unknown collection '{collection}'. Known: {sorted(COLLECTION_SCHEMAS)}",
+        }
+    return {"status": "success", "collection": collection, "schema": schema}
+
+
+describe_schema_tool = FunctionTool(func=describe_schema)
+
+_CLI_AGENT_TOOL = AgentTool(agent=cli_agent)
+
+
 async def call_cli_agent(
     request: str,
     tool_context: ToolContext,
@@ -140,21 +255,23 @@ async def call_cli_agent(
       The CLI agent's response (string). Also stored in state under "cli_agent_output".
     """
     print("\ncall_cli_agent with request:", request)
-    agent_tool = AgentTool(agent=cli_agent)
-    cli_agent_output = await agent_tool.run_async(
+    cli_agent_output = await _CLI_AGENT_TOOL.run_async(
         args={"request": request}, tool_context=tool_context
     )
     tool_context.state["cli_agent_output"] = cli_agent_output
     print("cli_agent_output =", cli_agent_output)
     return cli_agent_output
 
-ALL_RESOURCE_TOOLS: List[Any] = [
+
+ALL_RESOURCE_TOOLS: list[Any] = [
     fs_create_document_tool,
+    fs_bulk_create_documents_tool,
     fs_get_document_tool,
     fs_get_all_documents_tool,
     fs_update_document_tool,
     fs_update_document_field_tool,
     fs_delete_document_tool,
+    describe_schema_tool,
     call_cli_agent,
 ]
 
@@ -1,27 +1,51 @@
+import functools
 import os
-from typing import Any, Dict, Optional, List
+from typing import Any
+from collections.abc import Callable, Iterator
 
 from google.cloud import firestore
 
 # Read Firestore project from env
 FIRESTORE_PROJECT = os.getenv("FIRESTORE_PROJECT")
-if not FIRESTORE_PROJECT:
-    raise RuntimeError("Environment variable FIRESTORE_PROJECT must be set.")
 
+# Attempts per bulk write before it is given up and reported as failed.
+BULK_WRITE_MAX_ATTEMPTS = 5
+
+
+class BulkWriteError(RuntimeError):
+    """Some writes of a bulk create were never applied."""
+
+    def __init__(self, created_ids: list[str], failed: dict[str, str]):
+        super().__init__(
+            f"{len(failed)} of {len(created_ids) + len(failed)} writes failed: "
+            + "; ".join(f"{doc_id}: {message}" for doc_id, message in failed.items())
+        )
+        self.created_ids = created_ids
+        self.failed_ids = list(failed)
+
+@functools.lru_cache(maxsize=1)
 def create_firestore_database() -> firestore.Client:
     """
-    Initialize and return a Firestore client.
+    Initialize and return the process-wide Firestore client.
+
+    The client owns one multiplexed gRPC channel; every DAO call shares it rather
+    than paying a new channel handshake. Built on first use, so processes that
+    never touch Firestore skip credential discovery and channel setup.
     """
+    if not FIRESTORE_PROJECT:
+        raise RuntimeError("Environment variable FIRESTORE_PROJECT must be set.")
     return firestore.Client(project=FIRESTORE_PROJECT)
 
 
-_client = create_firestore_database()
+def _get_client() -> firestore.Client:
+    return create_firestore_database()
 
 
 def create_document(
     collection: str,
-    document: Dict[str, Any],
-    document_id: Optional[str] = None,
+    document: dict[str, Any],
+    document_id: str | None = None,
+    exclusive: bool = False,
 ) -> str:
     """
     Create a new document in the given collection.
@@ -30,14 +54,20 @@ def create_document(
         collection: Firestore collection name.
         document: Data to store.
         document_id: If provided, use this ID; otherwise Firestore will auto-generate one.
+        exclusive: If True, fail with google.api_core.exceptions.Conflict when a
+            document with `document_id` already exists instead of overwriting it.
 
     Returns:
         The document ID of the newly created document.
     """
-    col_ref = _client.collection(collection)
+    col_ref = _get_client().collection(collection)
     if document_id:
         doc_ref = col_ref.document(document_id)
-        doc_ref.set(document)
+        if exclusive:
+            # Server-side existence precondition: no read-then-write race.
+            doc_ref.create(document)
+        else:
+            doc_ref.set(document)
         return document_id
     else:
         doc_ref, _ = col_ref.add(document)
@@ -47,29 +77,89 @@ def create_document(
 def get_document(
     collection: str,
     document_id: str,
-) -> Optional[Dict[str, Any]]:
+    fields: list[str] | None = None,
+) -> dict[str, Any] | None:
     """
     Fetch a document by ID.
 
     Args:
         collection: Firestore collection name.
         document_id: ID of the document to retrieve.
+        fields: If provided, only return these fields (dot-notation allowed);
+            the mask is applied server-side.
 
     Returns:
         The document data as a dict, or None if not found.
     """
-    doc_ref = _client.collection(collection).document(document_id)
-    snapshot = doc_ref.get()
+    doc_ref = _get_client().collection(collection).document(document_id)
+    snapshot = doc_ref.get(field_paths=fields or None)
     if snapshot.exists:
         return snapshot.to_dict()
     else:
         return None
 
 
+def bulk_create_documents(
+    collection: str,
+    documents: list[dict[str, Any]],
+    document_ids: list[str | None] | None = None,
+) -> list[str]:
+    """
+    Create many documents in the given collection with batched writes.
+
+    Args:
+        collection: Firestore collection name.
+        documents: Data dicts to store.
+        document_ids: Optional IDs aligned with `documents`; a missing or empty
+            entry gets an auto-generated ID.
+
+    Returns:
+        The document IDs, in the order of `documents`.
+
+    Raises:
+        BulkWriteError: if any write still failed after BULK_WRITE_MAX_ATTEMPTS;
+            it carries the IDs that were written and the ones that were not.
+    """
+    if document_ids is not None and len(document_ids) > len(documents):
+        raise ValueError("document_ids cannot be longer than documents")
+    col_ref = _get_client().collection(collection)
+    ids = list(document_ids or [])
+    ids += [None] * (len(documents) - len(ids))
+
+    # BulkWriter packs up to 500 writes per commit, sends commits concurrently
+    # and retries throttled ones with backoff; close() blocks until all are done.
+    # It drops a write once its error handler gives up and close() never raises,
+    # so the handlers record each outcome here.
+    written: set[str] = set()
+    failed: dict[str, str] = {}
+
+    def on_result(reference: Any, _result: Any, _writer: Any) -> None:
+        written.add(reference.id)
+
+    def on_error(failure: Any, _writer: Any) -> bool:
+        if failure.attempts < BULK_WRITE_MAX_ATTEMPTS:
+            return True
+        failed[failure.operation.reference.id] = failure.message
+        return False
+
+    bulk_writer = _get_client().bulk_writer()
+    bulk_writer.on_write_result(on_result)
+    bulk_writer.on_write_error(on_error)
+    new_ids: list[str] = []
+    for doc_id, document in zip(ids, documents, strict=True):
+        doc_ref = col_ref.document(doc_id) if doc_id else col_ref.document()
+        bulk_writer.set(doc_ref, document)
+        new_ids.append(doc_ref.id)
+    bulk_writer.close()
+    if failed:
+        raise BulkWriteError([i for i in new_ids if i in written], failed)
+    return new_ids
+
+
 def update_document(
     collection: str,
     document_id: str,
-    new_document: Dict[str, Any],
+    new_document: dict[str, Any],
 ) -> None:
     """
     Overwrite an existing document with new data.
@@ -79,10 +169,69 @@ def update_document(
         document_id: ID of the document to overwrite.
         new_document: The new data dict.
     """
-    doc_ref = _client.collection(collection).document(document_id)
+    doc_ref = _get_client().collection(collection).document(document_id)
     doc_ref.set(new_document)
 
 
+def patch_document(
+    collection: str,
+    document_id: str,
+    fields: dict[str, Any],
+) -> None:
+    """
+    Overwrite only the given top-level fields of an existing document.
+
+    Args:
+        collection: Firestore collection name.
+        document_id: ID of the document to patch.
+        fields: {field name: new value}; names are taken literally (a '.' is not a path).
+    """
+    if not fields:
+        return
+    doc_ref = _get_client().collection(collection).document(document_id)
+    doc_ref.update(_literal_field_updates(fields))
+
+
+def _literal_field_updates(fields: dict[str, Any]) -> dict[str, Any]:
+    # FieldPath quoting keeps update() from splitting names on '.'.
+    return {firestore.FieldPath(name).to_api_repr(): value for name, value in fields.items()}
+
+
+def transform_document(
+    collection: str,
+    document_id: str,
+    transform: Callable[[dict[str, Any]], dict[str, Any]],
+) -> dict[str, Any] | None:
+    """
+    Read-modify-write one document in a transaction, so concurrent writers can't be lost.
+
+    Args:
+        collection: Firestore collection name.
+        document_id: ID of the document to change.
+        transform: gets the current data and returns {field name: new value} to write
+            (names taken literally, as in patch_document). Firestore re-runs it when a
+            concurrent write aborts the transaction, so it must be safe to call again.
+
+    Returns:
+        The document data with the written fields applied, or None if it does not exist.
+    """
+    client = _get_client()
+    doc_ref = client.collection(collection).document(document_id)
+
+    @firestore.transactional
+    def _read_modify_write(transaction: firestore.Transaction) -> dict[str, Any] | None:
+        snapshot = doc_ref.get(transaction=transaction)
+        if not snapshot.exists:
+            return None
+        data = snapshot.to_dict() or {}
+        fields = transform(data)
+        if fields:
+            transaction.update(doc_ref, _literal_field_updates(fields))
+        return {**data, **fields}
+
+    return _read_modify_write(client.transaction())
+
+
 def delete_document(
     collection: str,
     document_id: str,
@@ -94,7 +243,7 @@ def delete_document(
         collection: Firestore collection name.
         document_id: ID of the document to delete.
     """
-    doc_ref = _client.collection(collection).document(document_id)
+    doc_ref = _get_client().collection(collection).document(document_id)
     doc_ref.delete()
 
 
@@ -113,7 +262,7 @@ def update_document_field(
         field_name: The field to update (dot-notation for nested fields allowed).
         new_value: The new value for the field.
     """
-    doc_ref = _client.collection(collection).document(document_id)
+    doc_ref = _get_client().collection(collection).document(document_id)
     doc_ref.update({field_name: new_value})
 
 
@@ -121,22 +270,95 @@ def update_document_field(
 def get_all_documents(
     collection: str,
     include_ids: bool = True,
-) -> List[Dict[str, Any]]:
+    fields: list[str] | None = None,
+) -> list[dict[str, Any]]:
     """
     Retrieve all documents in a collection.
 
     Args:
         collection: Firestore collection name.
         include_ids: If True, include each document's ID under key 'id'.
+        fields: If provided, only return these fields (a server-side select() projection).
 
     Returns:
         A list of document dicts (empty list if none found).
     """
-    col_ref = _client.collection(collection)
-    docs: List[Dict[str, Any]] = []
-    for snap in col_ref.stream():
-        data = snap.to_dict() or {}
-        if include_ids:
-            data = {"id": snap.id, **data}
-        docs.append(data)
-    return docs
\ No newline at end of file
+    return list(iter_all_documents(collection, include_ids=include_ids, fields=fields))
+
+
+def iter_all_documents(
+    collection: str,
+    include_ids: bool = True,
+    fields: list[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Stream the documents of a collection one at a time.
+
+    Same dicts as get_all_documents, without holding the whole collection in memory.
+    """
+    query = _get_client().collection(collection)
+    if fields:
+        query = query.select(fields)
+    for snap in query.stream():
+        yield _snapshot_data(snap, include_ids)
+
+
+def _snapshot_data(snap: Any, include_ids: bool) -> dict[str, Any]:
+    data = snap.to_dict() or {}
+    if include_ids:
+        # In place rather than {"id": ..., **data}; a stored 'id' field still wins.
+        data.setdefault("id", snap.id)
+    return data
+
+
+def get_documents_by_ids(
+    collection: str,
+    document_ids: list[str],
+    include_ids: bool = True,
+    fields: list[str] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Fetch several documents by ID in a single batched read.
+
+    Args:
+        collection: Firestore collection name.
+        document_ids: IDs of the documents to retrieve.
+        include_ids: If True, include each document's ID under key 'id'.
+        fields: If provided, only return these fields (applied server-side).
+
+    Returns:
+        The found documents, in the order of document_ids; missing IDs are skipped.
+    """
+    col_ref = _get_client().collection(collection)
+    refs = [col_ref.document(doc_id) for doc_id in dict.fromkeys(document_ids)]
+    # One BatchGetDocuments RPC instead of a round-trip per document; results arrive unordered.
+    found: dict[str, dict[str, Any]] = {}
+    for snap in _get_client().get_all(refs, field_paths=fields or None):
+        if not snap.exists:
+            continue
+        found[snap.id] = _snapshot_data(snap, include_ids)
+    return [found[doc_id] for doc_id in dict.fromkeys(document_ids) if doc_id in found]
+
+
+def find_documents(
+    collection: str,
+    field_name: str,
+    value: Any,
+    include_ids: bool = True,
+) -> list[dict[str, Any]]:
+    """
+    Retrieve the documents whose `field_name` equals `value`.
+
+    Args:
+        collection: Firestore collection name.
+        field_name: Field to filter on (dot-notation for nested fields allowed).
+        value: Value the field must equal.
+        include_ids: If True, include each document's ID under key 'id'.
+
+    Returns:
+        A list of matching document dicts (empty list if none found).
+    """
+    query = _get_client().collection(collection).where(
+        filter=firestore.FieldFilter(field_name, "==", value)
+    )
+    return [_snapshot_data(snap, include_ids) for snap in query.stream()]
@@ -1,10 +1,17 @@
+import copy
 import os
-import json
-from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
-
-
-from ....sub_agents.storage.utils import download_json as gcs_download_json
+import operator
+import threading
+import time
+from typing import Any, TypeVar
+from collections.abc import Callable
+from urllib.parse import quote
+
+import orjson
+from google.api_core.exceptions import NotFound
+
+from ....sub_agents.storage.utils import download_json_if_changed as gcs_download_json_if_changed
+from ....sub_agents.storage.utils import retry_on_conflict
 from ....sub_agents.storage.utils import upload_json as gcs_upload_json
 
 # Config from env
@@ -16,17 +23,53 @@ RESOURCES_PROJECT = os.getenv("RESOURCES_PROJECT", "")
 RESOURCES_LOCATION = os.getenv("RESOURCES_LOCATION", "")
 ENVIRONMENT = os.getenv("ENVIRONMENT", "dev")
 
-if not RESOURCE_REGISTRY_BUCKET:
+# "gcs" keeps the whole registry in one JSON blob; "firestore" stores one document
+# per resource so each mutation writes only that resource (the blob is then only
+# used by export_registry_snapshot()).
+RESOURCE_REGISTRY_BACKEND = os.getenv("RESOURCE_REGISTRY_BACKEND", "gcs").lower()
+RESOURCE_REGISTRY_COLLECTION = os.getenv("RESOURCE_REGISTRY_COLLECTION", "resource_registry")
+_USE_FIRESTORE = RESOURCE_REGISTRY_BACKEND == "firestore"
+
+if not RESOURCE_REGISTRY_BUCKET and not _USE_FIRESTORE:
     raise RuntimeError("RESOURCE_REGISTRY_BUCKET env var must be set.")
 
+# Last registry seen in GCS and its blob generation; revalidated on every load.
+_REGISTRY_CACHE: dict[str, Any] | None = None
+_REGISTRY_GENERATION: int | None = None
+_REGISTRY_LOCK = threading.Lock()
+
+# In-memory only {resource id: position in "resources"}; stripped before anything is serialized.
+_ID_INDEX_KEY = "_id_index"
+# In-memory only: blob generation a loaded registry was read at (0 = blob did not exist).
+_GENERATION_KEY = "_generation"
+_PRIVATE_KEYS = frozenset((_ID_INDEX_KEY, _GENERATION_KEY))
+
+# Compare-and-swap retries when another writer updated the blob between load and save.
+REGISTRY_SAVE_RETRIES = 3
+
+T = TypeVar("T")
+
+# (snapshot, {type: [resources]}) for the last snapshot list_resources filtered.
+_TYPE_INDEX: tuple[dict[str, Any], dict[Any, list[dict[str, Any]]]] | None = None
+
 
 # Internal helpers
-def _now_iso() -> str:
-    # Match examples like 2025-08-10T12:00:00Z
-    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+_NOW_ISO_CACHE: tuple[int, str] = (-1, "")
 
 
-def _empty_registry() -> Dict[str, Any]:
+def _now_iso() -> str:
+    # Match examples like 2025-08-10T12:00:00Z; second resolution, so format once per second.
+    global _NOW_ISO_CACHE
+    now = int(time.time())
+    cached_at, cached = _NOW_ISO_CACHE
+    if now == cached_at:
+        return cached
+    formatted = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+    _NOW_ISO_CACHE = (now, formatted)
+    return formatted
+
+
+def _empty_registry() -> dict[str, Any]:
     return {
         "schema_version": "1.0",
         "project_id": RESOURCES_PROJECT,
@@ -36,50 +79,231 @@ def _empty_registry() -> Dict[str, Any]:
     }
 
 
-def _load_registry() -> Dict[str, Any]:
-    """Load the registry JSON from GCS. If missing or invalid, start a new one."""
+def _registry_snapshot() -> dict[str, Any]:
+    """
+    Return the current registry, shared and read-only. If missing or invalid, start a new one.
+
+    Any other read error propagates: treating it as "empty" would let the next
+    write replace the whole registry.
+
+    The parsed registry is cached with its blob generation, so an unchanged
+    registry costs one metadata GET instead of a full download. The GET runs
+    outside _REGISTRY_LOCK so concurrent readers don't wait on each other's
+    round trips. Cached objects are replaced, never mutated, so a snapshot stays
+    consistent after it is returned.
+    """
+    global _REGISTRY_CACHE, _REGISTRY_GENERATION
+    with _REGISTRY_LOCK:
+        cached, cached_generation = _REGISTRY_CACHE, _REGISTRY_GENERATION
     try:
-        data = gcs_download_json(RESOURCE_REGISTRY_BUCKET, RESOURCE_REGISTRY_FILE)
-        # Basic shape enforcement
-        if not isinstance(data, dict) or "resources" not in data or not isinstance(data["resources"], list):
-            return _empty_registry()
-        return data
-    except Exception:
-        # If blob doesn't exist or any other error → initialize minimal structure
-        return _empty_registry()
+        data, generation = gcs_download_json_if_changed(
+            RESOURCE_REGISTRY_BUCKET, RESOURCE_REGISTRY_FILE, cached_generation
+        )
+    except NotFound:
+        # First write must still find the blob absent.
+        _forget_registry(cached_generation)
+        return {**_empty_registry(), _GENERATION_KEY: 0}
+    if data is None and cached is not None:
+        return cached
+    # Basic shape enforcement
+    if not isinstance(data, dict) or "resources" not in data or not isinstance(data["resources"], list):
+        _forget_registry(cached_generation)
+        # Replacing the invalid blob is still conditional on nobody else fixing it first.
+        return {**_empty_registry(), _GENERATION_KEY: generation}
+    data[_GENERATION_KEY] = generation
+    _id_index(data)  # built once per generation, then copied along with the cache
+    _cache_registry(data, generation)
+    return data
+
+
+def _cache_registry(registry: dict[str, Any], generation: int) -> None:
+    """Install a registry unless a newer generation is already cached (generations only grow)."""
+    global _REGISTRY_CACHE, _REGISTRY_GENERATION
+    with _REGISTRY_LOCK:
+        if _REGISTRY_GENERATION is None or _REGISTRY_GENERATION < generation:
+            _REGISTRY_CACHE, _REGISTRY_GENERATION = registry, generation
+
+
+def _forget_registry(generation: int | None) -> None:
+    """Drop the cache if it still holds `generation` (nobody installed a newer one meanwhile)."""
+    global _REGISTRY_CACHE, _REGISTRY_GENERATION
+    with _REGISTRY_LOCK:
+        if _REGISTRY_GENERATION == generation:
+            _REGISTRY_CACHE, _REGISTRY_GENERATION = None, None
+
+
+def _load_registry() -> dict[str, Any]:
+    """Load the registry for mutation: a private copy of the current snapshot."""
+    return copy.deepcopy(_registry_snapshot())
+
+
+def _resources_of_type(registry: dict[str, Any], resource_type: str) -> list[dict[str, Any]]:
+    """Per-type lists for a snapshot, grouped once and reused until the snapshot changes."""
+    global _TYPE_INDEX
+    cached = _TYPE_INDEX
+    if cached is None or cached[0] is not registry:
+        by_type: dict[Any, list[dict[str, Any]]] = {}
+        for r in registry.get("resources", []):
+            by_type.setdefault(r.get("type"), []).append(r)
+        cached = _TYPE_INDEX = (registry, by_type)
+    return cached[1].get(resource_type, [])
+
+
+def _upload_registry(registry: dict[str, Any]) -> None:
+    """
+    Upload and cache `registry`; the cache keeps it as-is, so the caller must not modify it afterwards.
 
+    The upload is conditional on the generation the registry was loaded at, so a
+    concurrent writer's commit raises PreconditionFailed instead of being lost.
+    """
+    generation = gcs_upload_json(
+        RESOURCE_REGISTRY_BUCKET,
+        RESOURCE_REGISTRY_FILE,
+        _without_index(registry),
+        compress=True,
+        if_generation_match=registry.get(_GENERATION_KEY),
+    )
+    if generation is not None:
+        registry[_GENERATION_KEY] = generation
+        _cache_registry(registry, generation)
+
+
+def _mutate_registry(mutation: Callable[[dict[str, Any]], tuple[T, bool]]) -> T:
+    """
+    Apply `mutation` to a fresh copy of the registry and save it (compare-and-swap).
+
+    `mutation` returns (result, changed); nothing is written when changed is False.
+    On a generation conflict the registry is reloaded and the mutation replayed,
+    up to REGISTRY_SAVE_RETRIES times, so it must be safe to run more than once.
+    """
+    def _attempt() -> T:
+        registry = _load_registry()
+        result, changed = mutation(registry)
+        if changed:
+            _upload_registry(registry)
+        return result
+
+    return retry_on_conflict(_attempt, REGISTRY_SAVE_RETRIES)
+
+
+def _id_index(registry: dict[str, Any]) -> dict[Any, int]:
+    """Return the registry's id -> position index, building it on first use."""
+    index = registry.get(_ID_INDEX_KEY)
+    if index is None:
+        index = {}
+        for i, r in enumerate(registry.get("resources", [])):
+            # setdefault keeps the first match, like the linear scan it replaces.
+            index.setdefault(r.get("id"), i)
+        registry[_ID_INDEX_KEY] = index
+    return index
+
+
+def _without_index(registry: dict[str, Any]) -> dict[str, Any]:
+    """The registry without its in-memory bookkeeping keys (index, generation)."""
+    if _PRIVATE_KEYS.isdisjoint(registry):
+        return registry
+    return {k: v for k, v in registry.items() if k not in _PRIVATE_KEYS}
 
-def _save_registry(registry: Dict[str, Any]) -> None:
-    gcs_upload_json(RESOURCE_REGISTRY_BUCKET, RESOURCE_REGISTRY_FILE, registry)
 
+def _find_resource_index(registry: dict[str, Any], resource_id: str) -> int | None:
+    return _id_index(registry).get(resource_id)
 
-def _find_resource_index(registry: Dict[str, Any], resource_id: str) -> Optional[int]:
-    for i, r in enumerate(registry.get("resources", [])):
-        if r.get("id") == resource_id:
-            return i
-    return None
 
+_REQUIRED_FIELDS = ("id", "type", "name")
+_get_required = operator.itemgetter(*_REQUIRED_FIELDS)
+# Immutable defaults can be shared; containers get a fresh object per resource.
+_SCALAR_DEFAULTS = (("location", RESOURCES_LOCATION or ""), ("unique", False), ("purpose", ""))
+_CONTAINER_DEFAULTS = (("config", dict), ("outputs", dict), ("depends_on", list), ("tags", dict))
 
-def _validate_resource_payload(resource: Dict[str, Any]) -> None:
+
+def _validate_resource_payload(resource: dict[str, Any]) -> None:
     """
     Minimal schema validation. Raises ValueError if critical fields are missing.
     """
-    required = ["id", "type", "name"]
-    for k in required:
-        if not resource.get(k):
-            raise ValueError(f"Missing required resource field: '{k}'")
+    try:
+        valid = all(_get_required(resource))
+    except KeyError:
+        valid = False
+    if not valid:
+        # Slow path only to name the first missing field.
+        for k in _REQUIRED_FIELDS:
+            if not resource.get(k):
+                raise ValueError(f"Missing required resource field: '{k}'")
     # Defaults
-    resource.setdefault("location", RESOURCES_LOCATION or "")
-    resource.setdefault("unique", False)
-    resource.setdefault("purpose", "")
-    resource.setdefault("config", {})
-    resource.setdefault("outputs", {})
-    resource.setdefault("depends_on", [])
-    resource.setdefault("tags", {})
+    for k, v in _SCALAR_DEFAULTS:
+        resource.setdefault(k, v)
+    for k, factory in _CONTAINER_DEFAULTS:
+        if k not in resource:
+            resource[k] = factory()
+
+
+def _apply_updates(resource: dict[str, Any], updates: dict[str, Any]) -> None:
+    # Shallow merge in place for top-level keys; nested objects like config/outputs/tags are
+    # overwritten. Keys not in updates (created_at included) are left as they are.
+    resource.update(updates)
+    resource["updated_at"] = _now_iso()
+
+    # Validate minimal fields after merge
+    _validate_resource_payload(resource)
+
+
+# Firestore backend: one document per resource
+def _registry_dao():
+    # Imported on first use: dao builds a Firestore client and requires FIRESTORE_PROJECT.
+    from .firestore import dao
+    return dao
+
+
+def _doc_id(resource_id: str) -> str:
+    # Resource ids look like "firestore_db/(default)"; '/' is a path separator in Firestore.
+    return quote(resource_id, safe="")
+
+
+def _fs_get_resource(resource_id: str) -> dict[str, Any] | None:
+    return _registry_dao().get_document(RESOURCE_REGISTRY_COLLECTION, _doc_id(resource_id))
+
+
+def _fs_add_resource(resource: dict[str, Any]) -> str:
+    from google.api_core.exceptions import Conflict
+
+    try:
+        _registry_dao().create_document(
+            RESOURCE_REGISTRY_COLLECTION, resource, _doc_id(resource["id"]), exclusive=True
+        )
+    except Conflict:
+        raise ValueError(f"Resource with id '{resource['id']}' already exists.") from None
+    return resource["id"]
+
+
+def _fs_list_resources(resource_type: str | None) -> list[dict[str, Any]]:
+    dao = _registry_dao()
+    if resource_type:
+        # Single-field equality: served by Firestore's automatic index.
+        return dao.find_documents(RESOURCE_REGISTRY_COLLECTION, "type", resource_type, include_ids=False)
+    return dao.get_all_documents(RESOURCE_REGISTRY_COLLECTION, include_ids=False)
+
+
+def _fs_registry() -> dict[str, Any]:
+    registry = _empty_registry()
+    registry["resources"] = _fs_list_resources(None)
+    return registry
+
+
+def export_registry_snapshot() -> str:
+    """
+    Write the Firestore-backed registry to RESOURCE_REGISTRY_BUCKET as one JSON file.
+
+    Returns:
+        The gs:// URI of the snapshot.
+    """
+    if not RESOURCE_REGISTRY_BUCKET:
+        raise RuntimeError("RESOURCE_REGISTRY_BUCKET env var must be set.")
+    gcs_upload_json(RESOURCE_REGISTRY_BUCKET, RESOURCE_REGISTRY_FILE, _fs_registry(), compress=True)
+    return f"gs://{RESOURCE_REGISTRY_BUCKET}/{RESOURCE_REGISTRY_FILE}"
 
 
 # Public API
-def add_resource(resource: Dict[str, Any]) -> str:
+def add_resource(resource: dict[str, Any]) -> str:
     """
     Add a resource to the registry.
 
@@ -103,18 +327,26 @@ def add_resource(resource: Dict[str, Any]) -> str:
         ValueError if id already exists or payload invalid.
     """
     _validate_resource_payload(resource)
-    registry = _load_registry()
+    if _USE_FIRESTORE:
+        now = _now_iso()
+        resource.setdefault("created_at", now)
+        resource["updated_at"] = now
+        return _fs_add_resource(resource)
 
-    if _find_resource_index(registry, resource["id"]) is not None:
-        raise ValueError(f"Resource with id '{resource['id']}' already exists.")
+    def _add(registry: dict[str, Any]) -> tuple[str, bool]:
+        if _find_resource_index(registry, resource["id"]) is not None:
+            raise ValueError(f"Resource with id '{resource['id']}' already exists.")
 
-    now = _now_iso()
-    resource.setdefault("created_at", now)
-    resource["updated_at"] = now
+        now = _now_iso()
+        resource.setdefault("created_at", now)
+        resource["updated_at"] = now
 
-    registry["resources"].append(resource)
-    _save_registry(registry)
-    return resource["id"]
+        _id_index(registry)[resource["id"]] = len(registry["resources"])
+        # Each replay appends to its own (reloaded) registry, so share a copy.
+        registry["resources"].append(copy.deepcopy(resource))
+        return resource["id"], True
+
+    return _mutate_registry(_add)
 
 
 def delete_resource(resource_id: str) -> bool:
@@ -130,23 +362,35 @@ def delete_resource(resource_id: str) -> bool:
     Raises:
         PermissionError if delete_protection is True.
     """
-    registry = _load_registry()
-    idx = _find_resource_index(registry, resource_id)
-    if idx is None:
-        return False
-
-    res = registry["resources"][idx]
-    delete_protection = bool(res.get("config", {}).get("delete_protection", False))
-    if delete_protection:
-        raise PermissionError(f"Resource '{resource_id}' has delete_protection enabled.")
-
-    # Remove and save
-    registry["resources"].pop(idx)
-    _save_registry(registry)
-    return True
-
-
-def update_resource(resource_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+    if _USE_FIRESTORE:
+        res = _fs_get_resource(resource_id)
+        if res is None:
+            return False
+        if bool(res.get("config", {}).get("delete_protection", False)):
+            raise PermissionError(f"Resource '{resource_id}' has delete_protection enabled.")
+        _registry_dao().delete_document(RESOURCE_REGISTRY_COLLECTION, _doc_id(resource_id))
+        return True
+
+    def _delete(registry: dict[str, Any]) -> tuple[bool, bool]:
+        idx = _find_resource_index(registry, resource_id)
+        if idx is None:
+            return False, False
+
+        res = registry["resources"][idx]
+        delete_protection = bool(res.get("config", {}).get("delete_protection", False))
+        if delete_protection:
+            raise PermissionError(f"Resource '{resource_id}' has delete_protection enabled.")
+
+        # Remove and save
+        registry["resources"].pop(idx)
+        # Positions after idx shift; rebuild lazily on the next lookup.
+        registry.pop(_ID_INDEX_KEY, None)
+        return True, True
+
+    return _mutate_registry(_delete)
+
+
+def update_resource(resource_id: str, updates: dict[str, Any]) -> dict[str, Any]:
     """
     Update fields of an existing resource (merge/replace by keys).
 
@@ -163,29 +407,36 @@ def update_resource(resource_id: str, updates: Dict[str, Any]) -> Dict[str, Any]
     if "id" in updates and updates["id"] != resource_id:
         raise ValueError("Cannot change resource 'id' in update.")
 
-    registry = _load_registry()
-    idx = _find_resource_index(registry, resource_id)
-    if idx is None:
-        raise ValueError(f"Resource with id '{resource_id}' not found.")
+    if _USE_FIRESTORE:
+        def _changed_fields(current: dict[str, Any]) -> dict[str, Any]:
+            merged = dict(current)
+            _apply_updates(merged, updates)
+            # Write only the fields that changed (incl. updated_at and any defaults filled in).
+            return {k: v for k, v in merged.items() if k not in current or current[k] != v}
 
-    current = registry["resources"][idx]
+        # Read and write in one transaction: a concurrent update can't be overwritten
+        # with the stale fields this one read.
+        updated = _registry_dao().transform_document(
+            RESOURCE_REGISTRY_COLLECTION, _doc_id(resource_id), _changed_fields
+        )
+        if updated is None:
+            raise ValueError(f"Resource with id '{resource_id}' not found.")
+        return updated
 
-    # Shallow merge for top-level keys; nested objects like config/outputs/tags are overwritten
-    merged = {**current, **updates, "updated_at": _now_iso()}
+    def _update(registry: dict[str, Any]) -> tuple[dict[str, Any], bool]:
+        idx = _find_resource_index(registry, resource_id)
+        if idx is None:
+            raise ValueError(f"Resource with id '{resource_id}' not found.")
 
-    # Keep created_at from original if missing
-    if "created_at" not in merged and "created_at" in current:
-        merged["created_at"] = current["created_at"]
+        # The registry is a private copy, so the resource can be patched in place.
+        current = registry["resources"][idx]
+        _apply_updates(current, updates)
+        return copy.deepcopy(current), True
 
-    # Validate minimal fields after merge
-    _validate_resource_payload(merged)
-
-    registry["resources"][idx] = merged
-    _save_registry(registry)
-    return merged
+    return _mutate_registry(_update)
 
 
-def list_resources(resource_type: Optional[str] = None) -> List[Dict[str, Any]]:
+def list_resources(resource_type: str | None = None) -> list[dict[str, Any]]:
     """
     List resources, optionally filtered by type.
 
@@ -195,11 +446,14 @@ def list_resources(resource_type: Optional[str] = None) -> List[Dict[str, Any]]:
     Returns:
         List of resource dicts.
     """
-    registry = _load_registry()
-    items = registry.get("resources", [])
+    if _USE_FIRESTORE:
+        return _fs_list_resources(resource_type)
+
+    # Read from the shared snapshot and copy only what is returned, not the whole registry.
+    registry = _registry_snapshot()
     if resource_type:
-        return [r for r in items if r.get("type") == resource_type]
-    return items
+        return copy.deepcopy(_resources_of_type(registry, resource_type))
+    return copy.deepcopy(registry.get("resources", []))
 
 
 def get_resources_json(pretty: bool = True) -> str:
@@ -212,5 +466,7 @@ def get_resources_json(pretty: bool = True) -> str:
     Returns:
         JSON string of the registry.
     """
-    registry = _load_registry()
-    return json.dumps(registry, indent=2 if pretty else None)
\ No newline at end of file
+    registry = _fs_registry() if _USE_FIRESTORE else _registry_snapshot()
+    # orjson's compact output already has no padding after ',' and ':'.
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    return orjson.dumps(_without_index(registry), default=str, option=option).decode("utf-8")
\ No newline at end of file
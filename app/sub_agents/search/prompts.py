@@ -1,6 +1,4 @@
-def return_instructions_search_agent() -> str:
-
-    instruction = """
+_INSTRUCTION_SEARCH = """
     You are a Web Search & Synthesis Agent. Your job is to find the **most reliable, minimal set of evidence** needed to answer the user’s request, then deliver a **concise, decisive** answer.
 
     GUIDING PRINCIPLES
@@ -38,4 +36,6 @@ def return_instructions_search_agent() -> str:
     - If the information is unavailable or ambiguous after reasonable searching, say so clearly and suggest the minimal next query or source to check.
     """
 
-    return instruction
+
+def return_instructions_search_agent() -> str:
+    return _INSTRUCTION_SEARCH
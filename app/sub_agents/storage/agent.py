@@ -2,7 +2,7 @@
 
 import os
 from google.adk.agents import Agent
-from google.genai import types
+from ...utils.generation import GEN_CFG_LOW
 
 from .prompts import return_instructions_storage_agent
 from .tools import ALL_STORAGE_TOOLS
@@ -12,5 +12,5 @@ storage_agent = Agent(
     name="storage_agent",
     instruction=return_instructions_storage_agent(),
     tools=ALL_STORAGE_TOOLS,
-    generate_content_config=types.GenerateContentConfig(temperature=0.01),
+    generate_content_config=GEN_CFG_LOW,
 )
\ No newline at end of file
@@ -1,4 +1,5 @@
-from typing import Dict, Any, List, Optional
+import asyncio
+from typing import Any, Optional
 
 from google.adk.tools import FunctionTool, ToolContext
 
@@ -8,12 +9,14 @@ from .utils import (
     create_strategy as _create_strategy,
     update_strategy_by_id as _update_strategy,
     delete_strategy_by_id as _delete_strategy,
+    apply_strategy_changes as _apply_strategy_changes,
     create_strategy_file as _create_strategy_file,
     create_business_config_file as _create_business_config_file,
+    create_all_files as _create_all_files,
 )
 
 
-def get_business_configuration() -> Dict[str, Any]:
+async def get_business_configuration() -> dict[str, Any]:
     """Retrieves the business configuration (definition, description, goals).
 
     Use this tool when the agent needs to know the business context.
@@ -24,7 +27,7 @@ def get_business_configuration() -> Dict[str, Any]:
       - error_message: the exception text (on error)
     """
     try:
-        config = _fetch_business_config()
+        config = await asyncio.to_thread(_fetch_business_config)
         return {"status": "success", "config": config}
     except Exception as e:
         return {"status": "error", "error_message": str(e)}
@@ -33,7 +36,7 @@ def get_business_configuration() -> Dict[str, Any]:
 get_business_configuration_tool = FunctionTool(get_business_configuration)
 
 
-def get_all_strategies() -> Dict[str, Any]:
+async def get_all_strategies() -> dict[str, Any]:
     """Fetches the list of all active strategies.
 
     Returns:
@@ -42,7 +45,7 @@ def get_all_strategies() -> Dict[str, Any]:
       - error_message: the exception text (on error)
     """
     try:
-        strategies = _fetch_strategies()
+        strategies = await asyncio.to_thread(_fetch_strategies)
         return {"status": "success", "strategies": strategies}
     except Exception as e:
         return {"status": "error", "error_message": str(e)}
@@ -51,7 +54,7 @@ def get_all_strategies() -> Dict[str, Any]:
 get_all_strategies_tool = FunctionTool(get_all_strategies)
 
 
-def create_strategy(strategy: Dict[str, Any]) -> Dict[str, Any]:
+async def create_strategy(strategy: dict[str, Any]) -> dict[str, Any]:
     """Adds a new strategy to the strategies configuration.
 
     Args:
@@ -67,7 +70,7 @@ def create_strategy(strategy: Dict[str, Any]) -> Dict[str, Any]:
       - error_message: exception text (on error)
     """
     try:
-        new_id = _create_strategy(strategy)
+        new_id = await asyncio.to_thread(_create_strategy, strategy)
         return {"status": "success", "strategy_id": new_id}
     except Exception as e:
         return {"status": "error", "error_message": str(e)}
@@ -76,7 +79,7 @@ def create_strategy(strategy: Dict[str, Any]) -> Dict[str, Any]:
 create_strategy_tool = FunctionTool(create_strategy)
 
 
-def update_strategy(updated_strategy: Dict[str, Any]) -> Dict[str, Any]:
+async def update_strategy(updated_strategy: dict[str, Any]) -> dict[str, Any]:
     """Updates an existing strategy by its ID.
 
     Args:
@@ -89,7 +92,7 @@ def update_strategy(updated_strategy: Dict[str, Any]) -> Dict[str, Any]:
       - error_message: if strategy not found or on exception
     """
     try:
-        ok = _update_strategy(updated_strategy)
+        ok = await asyncio.to_thread(_update_strategy, updated_strategy)
         if not ok:
             return {"status": "error", "error_message": "Strategy not found"}
         return {"status": "success"}
@@ -100,7 +103,7 @@ def update_strategy(updated_strategy: Dict[str, Any]) -> Dict[str, Any]:
 update_strategy_tool = FunctionTool(update_strategy)
 
 
-def delete_strategy(strategy_id: str) -> Dict[str, Any]:
+async def delete_strategy(strategy_id: str) -> dict[str, Any]:
     """Deletes a strategy by its ID.
 
     Args:
@@ -111,7 +114,7 @@ def delete_strategy(strategy_id: str) -> Dict[str, Any]:
       - error_message: if strategy not found or on exception
     """
     try:
-        ok = _delete_strategy(strategy_id)
+        ok = await asyncio.to_thread(_delete_strategy, strategy_id)
         if not ok:
             return {"status": "error", "error_message": "Strategy not found"}
         return {"status": "success"}
@@ -122,7 +125,38 @@ def delete_strategy(strategy_id: str) -> Dict[str, Any]:
 delete_strategy_tool = FunctionTool(delete_strategy)
 
 
-def create_strategy_file_tool_fn(filename: Optional[str] = "strategies.json") -> Dict[str, Any]:
+async def apply_strategy_changes(
+    create: Optional[list[dict[str, Any]]] = None,
+    update: Optional[list[dict[str, Any]]] = None,
+    delete: Optional[list[str]] = None,
+) -> dict[str, Any]:
+    """Creates, updates and deletes several strategies in one save.
+
+    Use this instead of repeated create_strategy/update_strategy/delete_strategy
+    calls when a request changes more than one strategy.
+
+    Args:
+      create: list of new strategy dicts (same fields as create_strategy).
+      update: list of dicts, each with a strategy_id plus the fields to update.
+      delete: list of strategy ids to delete.
+
+    Returns:
+      - status: "success" or "error"
+      - created / updated / deleted: the affected strategy ids (on success)
+      - not_found: ids from update/delete that did not exist (on success)
+      - error_message: exception text (on error)
+    """
+    try:
+        result = await asyncio.to_thread(_apply_strategy_changes, create, update, delete)
+        return {"status": "success", **result}
+    except Exception as e:
+        return {"status": "error", "error_message": str(e)}
+
+
+apply_strategy_changes_tool = FunctionTool(apply_strategy_changes)
+
+
+async def create_strategy_file_tool_fn(filename: Optional[str] = "strategies.json") -> dict[str, Any]:
     """Creates an empty strategies file (JSON array) in Cloud Storage.
 
     Args:
@@ -134,7 +168,7 @@ def create_strategy_file_tool_fn(filename: Optional[str] = "strategies.json") ->
       - error_message: exception text (on error)
     """
     try:
-        uri = _create_strategy_file(filename or "strategies.json")
+        uri = await asyncio.to_thread(_create_strategy_file, filename or "strategies.json")
         return {"status": "success", "gcs_uri": uri}
     except Exception as e:
         return {"status": "error", "error_message": str(e)}
@@ -143,10 +177,10 @@ def create_strategy_file_tool_fn(filename: Optional[str] = "strategies.json") ->
 create_strategy_file_tool = FunctionTool(create_strategy_file_tool_fn)
 
 
-def create_business_config_file_tool_fn(
-    config: Dict[str, Any],
+async def create_business_config_file_tool_fn(
+    config: dict[str, Any],
     filename: Optional[str] = "business_config.json",
-) -> Dict[str, Any]:
+) -> dict[str, Any]:
     """Creates a business configuration file in Cloud Storage.
 
     Args:
@@ -159,7 +193,9 @@ def create_business_config_file_tool_fn(
       - error_message: exception text (on error)
     """
     try:
-        uri = _create_business_config_file(config, filename or "business_config.json")
+        uri = await asyncio.to_thread(
+            _create_business_config_file, config, filename or "business_config.json"
+        )
         return {"status": "success", "gcs_uri": uri}
     except Exception as e:
         return {"status": "error", "error_message": str(e)}
@@ -168,12 +204,51 @@ def create_business_config_file_tool_fn(
 create_business_config_file_tool = FunctionTool(create_business_config_file_tool_fn)
 
 
+async def create_all_files_tool_fn(
+    config: dict[str, Any],
+    strategies_filename: Optional[str] = "strategies.json",
+    business_config_filename: Optional[str] = "business_config.json",
+) -> dict[str, Any]:
+    """Creates both the strategies file and the business configuration file.
+
+    Nothing is created if either file already exists.
+
+    Args:
+      config: Dict with at least 'name' for the business config. Other fields will be defaulted.
+      strategies_filename: Optional override; defaults to 'strategies.json'.
+      business_config_filename: Optional override; defaults to 'business_config.json'.
+
+    Returns:
+      - status: "success" or "error"
+      - gcs_uris: {"strategies": uri, "business_config": uri} (on success)
+      - error_message: exception text (on error)
+    """
+    try:
+        uris = await asyncio.to_thread(
+            _create_all_files,
+            config,
+            strategies_filename or "strategies.json",
+            business_config_filename or "business_config.json",
+        )
+        return {"status": "success", "gcs_uris": uris}
+    except Exception as e:
+        return {"status": "error", "error_message": str(e)}
+
+
+create_all_files_tool = FunctionTool(create_all_files_tool_fn)
+
+
+# FunctionTool only records the function at construction; the declaration is built
+# lazily by ADK. The storage agent is part of the root agent, so deferring these
+# wrappers would not skip any work; they are built once here and shared.
 ALL_STORAGE_TOOLS = [
     get_business_configuration_tool,
     get_all_strategies_tool,
     create_strategy_tool,
     update_strategy_tool,
     delete_strategy_tool,
+    apply_strategy_changes_tool,
     create_strategy_file_tool,
     create_business_config_file_tool,
+    create_all_files_tool,
 ]
\ No newline at end of file
@@ -1,10 +1,18 @@
+import contextlib
+import copy
+import functools
+import gzip
 import os
-import json
+import random
+import threading
+import time
 import uuid
-from typing import Optional, Dict, Any, List
+from typing import Any, TypeVar
+from collections.abc import Callable
 
+import orjson
 from google.cloud import storage
-from google.api_core.exceptions import NotFound, Conflict
+from google.api_core.exceptions import NotFound, Conflict, PreconditionFailed
 
 # env configs
 BUSINESS_CONFIG_PROJECT = os.getenv("BUSINESS_CONFIG_JSON_PROJECT")
@@ -15,26 +23,48 @@ STRATEGIES_PROJECT = os.getenv("STRATEGIES_JSON_PROJECT")
 STRATEGIES_BUCKET = os.getenv("STRATEGIES_JSON_BUCKET")
 STRATEGIES_FILE = os.getenv("STRATEGIES_JSON_FILE")
 
+# Uploads are compact JSON; set PROMOSPHERE_PRETTY_JSON=1 to write indented files for humans.
+PRETTY_JSON = os.getenv("PROMOSPHERE_PRETTY_JSON") == "1"
 
-def _get_storage_client(project: Optional[str] = None) -> storage.Client:
-    """Initialize and return a Google Cloud Storage client (optionally for a project)."""
+# (bucket, blob) -> (generation, parsed strategies, strategy_id index); revalidated
+# against GCS on every read.
+_STRATEGIES_CACHE: dict[tuple[str, str], tuple[int, Any, "_StrategyIndex"]] = {}
+_STRATEGIES_LOCK = threading.Lock()
+
+# Compare-and-swap retries when another writer saved the strategies between our read and write.
+STRATEGIES_SAVE_RETRIES = 3
+
+T = TypeVar("T")
+
+
+def _json_loads(content: Any) -> Any:
+    """Parse JSON from str or bytes."""
+    return orjson.loads(content)
+
+
+def _json_dumps(data: Any, pretty: bool = PRETTY_JSON) -> Any:
+    """Serialize to compact (or indented) JSON bytes; upload_from_string takes bytes."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+
+
+@functools.cache
+def _get_storage_client(project: str | None = None) -> storage.Client:
+    """
+    Return the shared Google Cloud Storage client (optionally for a project).
+
+    One client per project for the process lifetime: credentials, the HTTP
+    session and its TLS connections are reused by every call.
+    """
     return storage.Client(project=project) if project else storage.Client()
 
 
-def _get_bucket(project: Optional[str], bucket_name: str) -> storage.Bucket:
+def _get_bucket(project: str | None, bucket_name: str) -> storage.Bucket:
     """Helper to fetch a bucket with an optional explicit project."""
     client = _get_storage_client(project)
     return client.bucket(bucket_name)
 
 
-def _blob_exists(project: Optional[str], bucket_name: str, blob_name: str) -> bool:
-    """Check if a blob exists in GCS (optionally under a specific project)."""
-    client = _get_storage_client(project)
-    blob = client.bucket(bucket_name).blob(blob_name)
-    return blob.exists(client)
-
-
-def _ensure_bucket_exists(project: Optional[str], bucket_name: str) -> storage.Bucket:
+def _ensure_bucket_exists(project: str | None, bucket_name: str) -> storage.Bucket:
     """
     Ensure a GCS bucket exists. If not, create it.
     Args:
@@ -60,19 +90,85 @@ def download_json(bucket_name: str, blob_name: str) -> Any:
     client = _get_storage_client()
     bucket = client.bucket(bucket_name)
     blob = bucket.blob(blob_name)
-    content = blob.download_as_text()
-    return json.loads(content)
+    # Both parsers take UTF-8 bytes directly; no intermediate str decode.
+    content = blob.download_as_bytes()
+    return _json_loads(content)
+
+
+def download_json_if_changed(
+    bucket_name: str, blob_name: str, generation: int | None = None
+) -> tuple[Any, int | None]:
+    """
+    Download a JSON blob only if its generation differs from `generation`.
 
+    Args:
+        bucket_name: bucket holding the blob.
+        blob_name: name of the blob.
+        generation: generation the caller already has, if any.
+
+    Returns:
+        (data, generation) when the blob changed, or (None, generation) when it did not.
 
-def upload_json(bucket_name: str, blob_name: str, data: Any) -> None:
-    """Upload a JSON-serializable object to GCS."""
+    Raises:
+        NotFound if the blob does not exist.
+    """
+    client = _get_storage_client()
+    # Metadata-only GET; the media download below is skipped when nothing changed.
+    blob = client.bucket(bucket_name).get_blob(blob_name)
+    if blob is None:
+        raise NotFound(f"gs://{bucket_name}/{blob_name}")
+    if generation is not None and blob.generation == generation:
+        return None, generation
+    # The blob handle carries the generation, so this reads exactly that version.
+    content = blob.download_as_bytes()
+    if content[:2] == _GZIP_MAGIC:
+        # Served compressed (raw download / no transcoding); inflate locally.
+        content = gzip.decompress(content)
+    return _json_loads(content), blob.generation
+
+
+_GZIP_MAGIC = b"\x1f\x8b"
+# Body of a fresh strategies file; bytes go to the upload as-is, with no encode step.
+_EMPTY_ARRAY_BYTES = b"[]"
+
+
+def upload_json(
+    bucket_name: str,
+    blob_name: str,
+    data: Any,
+    compress: bool = False,
+    if_generation_match: int | None = None,
+) -> int | None:
+    """
+    Upload a JSON-serializable object to GCS and return the new blob generation.
+
+    With compress=True the object is stored gzipped with Content-Encoding: gzip;
+    readers that don't accept gzip still get plain JSON via GCS transcoding.
+    With if_generation_match the write only succeeds if the blob is still at that
+    generation (0 = must not exist); otherwise PreconditionFailed is raised.
+    """
     client = _get_storage_client()
     bucket = client.bucket(bucket_name)
     blob = bucket.blob(blob_name)
-    blob.upload_from_string(json.dumps(data, indent=2), content_type="application/json")
-
-
-def get_business_config_file(location: Optional[str] = None) -> Dict[str, Any]:
+    if compress:
+        payload = _json_dumps(data, pretty=False)
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        payload = gzip.compress(payload, compresslevel=6)
+        blob.content_encoding = "gzip"
+        blob.upload_from_string(
+            payload, content_type="application/json", if_generation_match=if_generation_match
+        )
+    else:
+        blob.upload_from_string(
+            _json_dumps(data),
+            content_type="application/json",
+            if_generation_match=if_generation_match,
+        )
+    return blob.generation
+
+
+def get_business_config_file(location: str | None = None) -> dict[str, Any]:
     """
     Get the business config JSON from Cloud Storage.
 
@@ -86,7 +182,49 @@ def get_business_config_file(location: Optional[str] = None) -> Dict[str, Any]:
     return download_json(BUSINESS_CONFIG_BUCKET, file_name)
 
 
-def get_strategies_file(file_name: Optional[str] = None) -> List[Dict[str, Any]]:
+class _StrategyIndex:
+    """strategy_id -> position of its first occurrence, plus the ids that occur more than once."""
+
+    __slots__ = ("duplicates", "positions")
+
+    def __init__(self, strategies: Any):
+        self.positions: dict[Any, int] = {}
+        duplicates = set()
+        if isinstance(strategies, list):
+            for i, strat in enumerate(strategies):
+                sid = strat.get("strategy_id") if isinstance(strat, dict) else None
+                if self.positions.setdefault(sid, i) != i:
+                    duplicates.add(sid)
+        self.duplicates = frozenset(duplicates)
+
+
+def _cache_strategies(key: tuple[str, str], generation: int, data: Any, index: _StrategyIndex) -> None:
+    """Install a snapshot unless a newer generation is already cached (generations only grow)."""
+    with _STRATEGIES_LOCK:
+        cached = _STRATEGIES_CACHE.get(key)
+        if cached is None or cached[0] < generation:
+            _STRATEGIES_CACHE[key] = (generation, data, index)
+
+
+def _load_strategies(file_name: str | None = None) -> tuple[Any, _StrategyIndex, int]:
+    """The cached strategies list, its id index and its generation; all shared, treat as read-only."""
+    fname = file_name or STRATEGIES_FILE
+    key = (STRATEGIES_BUCKET, fname)
+    with _STRATEGIES_LOCK:
+        cached = _STRATEGIES_CACHE.get(key)
+    # Metadata GET only, outside the lock so readers don't queue behind each other's
+    # round trips; the body is downloaded just when the generation moved.
+    data, generation = download_json_if_changed(
+        STRATEGIES_BUCKET, fname, cached[0] if cached else None
+    )
+    if data is None and cached is not None:
+        return cached[1], cached[2], generation
+    index = _StrategyIndex(data)
+    _cache_strategies(key, generation, data, index)
+    return data, index, generation
+
+
+def get_strategies_file(file_name: str | None = None) -> list[dict[str, Any]]:
     """
     Get the strategies JSON array from Cloud Storage.
 
@@ -94,16 +232,73 @@ def get_strategies_file(file_name: Optional[str] = None) -> List[Dict[str, Any]]
         file_name: optional override for the filename in the bucket.
 
     Returns:
-        List of strategy dicts.
+        List of strategy dicts, shared with the cache: do not modify it.
     """
-    fname = file_name or STRATEGIES_FILE
-    return download_json(STRATEGIES_BUCKET, fname)
+    return _load_strategies(file_name)[0]
+
 
+def _save_strategies(
+    strategies: list[dict[str, Any]],
+    file_name: str | None = None,
+    if_generation_match: int | None = None,
+) -> None:
+    """
+    Helper to save the strategies list back to Cloud Storage.
 
-def _save_strategies(strategies: List[Dict[str, Any]], file_name: Optional[str] = None) -> None:
-    """Helper to save the strategies list back to Cloud Storage."""
+    With if_generation_match the save fails with PreconditionFailed if someone
+    else wrote the file since that generation was read. The cache keeps
+    `strategies` itself, so the caller must not modify it afterwards.
+    """
     fname = file_name or STRATEGIES_FILE
-    upload_json(STRATEGIES_BUCKET, fname, strategies)
+    generation = upload_json(
+        STRATEGIES_BUCKET, fname, strategies, if_generation_match=if_generation_match
+    )
+    if generation is not None:
+        _cache_strategies(
+            (STRATEGIES_BUCKET, fname), generation, strategies, _StrategyIndex(strategies)
+        )
+
+
+def _backoff(attempt: int) -> None:
+    time.sleep(random.uniform(0.05, 0.2) * (attempt + 1))
+
+
+def retry_on_conflict(attempt_write: Callable[[], T], retries: int) -> T:
+    """
+    Run a read-modify-write until its conditional save lands.
+
+    `attempt_write` must re-read on every call and save with if_generation_match;
+    when another writer got in first (PreconditionFailed) it is retried after a
+    jittered backoff, up to `retries` more times.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return attempt_write()
+        except PreconditionFailed:
+            if attempt == retries:
+                raise
+        _backoff(attempt)
+    raise AssertionError("unreachable")
+
+
+def _mutate_strategies(mutation: Callable[[Any, _StrategyIndex], tuple[T, bool]]) -> T:
+    """
+    Read-modify-write the strategies file as a compare-and-swap.
+
+    `mutation` edits the loaded list in place and returns (result, changed); nothing
+    is written when changed is False. It is replayed on a fresh list when another
+    writer got in first, so it must be safe to run more than once.
+    """
+    def _attempt() -> T:
+        shared, index, generation = _load_strategies()
+        # Only writers pay for a copy; the cached list stays untouched until the save lands.
+        strategies = copy.deepcopy(shared)
+        result, changed = mutation(strategies, index)
+        if changed:
+            _save_strategies(strategies, if_generation_match=generation)
+        return result
+
+    return retry_on_conflict(_attempt, STRATEGIES_SAVE_RETRIES)
 
 
 def delete_strategy_by_id(strategy_id: str) -> bool:
@@ -116,15 +311,23 @@ def delete_strategy_by_id(strategy_id: str) -> bool:
     Returns:
         True if a strategy was deleted, False otherwise.
     """
-    strategies = get_strategies_file()
-    filtered = [s for s in strategies if s.get("strategy_id") != strategy_id]
-    if len(filtered) == len(strategies):
-        return False  # no strategy found
-    _save_strategies(filtered)
-    return True
-
-
-def update_strategy_by_id(updated_strategy: Dict[str, Any]) -> bool:
+    def _delete(strategies: Any, index: _StrategyIndex) -> tuple[bool, bool]:
+        idx = index.positions.get(strategy_id)
+        if idx is None:
+            return False, False  # no strategy found
+        if strategy_id in index.duplicates:
+            # Rare: the same id was stored more than once; drop every copy in place.
+            # Nothing before the first occurrence can match, so scan back only to idx.
+            for i in range(len(strategies) - 1, idx, -1):
+                if strategies[i].get("strategy_id") == strategy_id:
+                    del strategies[i]
+        del strategies[idx]
+        return True, True
+
+    return _mutate_strategies(_delete)
+
+
+def update_strategy_by_id(updated_strategy: dict[str, Any]) -> bool:
     """
     Update an existing strategy object in the strategies JSON.
 
@@ -137,22 +340,19 @@ def update_strategy_by_id(updated_strategy: Dict[str, Any]) -> bool:
     if "strategy_id" not in updated_strategy:
         raise ValueError("updated_strategy must contain 'strategy_id'")
 
-    strategies = get_strategies_file()
-    updated = False
-    for idx, strat in enumerate(strategies):
-        if strat.get("strategy_id") == updated_strategy["strategy_id"]:
-            strategies[idx] = {**strat, **updated_strategy}
-            updated = True
-            break
+    def _update(strategies: Any, index: _StrategyIndex) -> tuple[bool, bool]:
+        idx = index.positions.get(updated_strategy["strategy_id"])
+        if idx is None:
+            return False, False
 
-    if not updated:
-        return False
+        # The list is a private copy (see _mutate_strategies), so merge in place.
+        strategies[idx].update(copy.deepcopy(updated_strategy))
+        return True, True
 
-    _save_strategies(strategies)
-    return True
+    return _mutate_strategies(_update)
 
 
-def create_strategy(strategy_json: Dict[str, Any]) -> str:
+def create_strategy(strategy_json: dict[str, Any]) -> str:
     """
     Add a new strategy object to the strategies JSON.
 
@@ -162,49 +362,166 @@ def create_strategy(strategy_json: Dict[str, Any]) -> str:
     Returns:
         The generated UUID for the new strategy.
     """
-    strategies = get_strategies_file()
     new_id = strategy_json.get("strategy_id") or str(uuid.uuid4())
     strategy_json["strategy_id"] = new_id
-    strategies.append(strategy_json)
-    _save_strategies(strategies)
-    return new_id
 
+    def _create(strategies: Any, index: _StrategyIndex) -> tuple[str, bool]:
+        # Copied so the cached list never aliases the caller's dict.
+        strategies.append(copy.deepcopy(strategy_json))
+        return new_id, True
 
-def create_strategy_file(filename: str = "strategies.json") -> str:
-    if not STRATEGIES_BUCKET:
-        raise EnvironmentError("STRATEGIES_JSON_BUCKET is not set")
+    return _mutate_strategies(_create)
 
-    if _blob_exists(STRATEGIES_PROJECT, STRATEGIES_BUCKET, filename):
-        raise FileExistsError(f"file already exists: gs://{STRATEGIES_BUCKET}/{filename}")
 
-    bucket = _ensure_bucket_exists(STRATEGIES_PROJECT, STRATEGIES_BUCKET)
-    blob = bucket.blob(filename)
-    blob.upload_from_string("[]", content_type="application/json")
-
-    return f"gs://{STRATEGIES_BUCKET}/{filename}"
+def apply_strategy_changes(
+    create: list[dict[str, Any]] | None = None,
+    update: list[dict[str, Any]] | None = None,
+    delete: list[str] | None = None,
+) -> dict[str, list[str]]:
+    """
+    Apply several strategy changes with a single read-modify-write of the file.
 
+    Updates are merged first, then deletes are applied, then new strategies are
+    appended, so a strategy both updated and deleted ends up deleted.
 
-def create_business_config_file(config: Dict[str, Any], filename: str = "business_config.json") -> str:
-    if not BUSINESS_CONFIG_BUCKET:
-        raise EnvironmentError("BUSINESS_CONFIIG_JSON_BUCKET is not set")
+    Args:
+        create: new strategy dicts; each gets a 'strategy_id' if it has none.
+        update: dicts with at least 'strategy_id' plus the fields to change.
+        delete: ids of strategies to remove.
 
+    Returns:
+        {"created": [...], "updated": [...], "deleted": [...], "not_found": [...]} (ids).
+    """
+    create, update, delete = create or [], update or [], delete or []
+    if any("strategy_id" not in u for u in update):
+        raise ValueError("every update must contain 'strategy_id'")
+    for strategy_json in create:
+        strategy_json["strategy_id"] = strategy_json.get("strategy_id") or str(uuid.uuid4())
+
+    def _apply(strategies: Any, index: _StrategyIndex) -> tuple[dict[str, list[str]], bool]:
+        result: dict[str, list[str]] = {"created": [], "updated": [], "deleted": [], "not_found": []}
+        for updated_strategy in update:
+            sid = updated_strategy["strategy_id"]
+            idx = index.positions.get(sid)
+            if idx is None:
+                result["not_found"].append(sid)
+            else:
+                strategies[idx].update(copy.deepcopy(updated_strategy))
+                result["updated"].append(sid)
+        doomed = {sid for sid in delete if sid in index.positions}
+        result["deleted"] = [sid for sid in delete if sid in doomed]
+        result["not_found"].extend(sid for sid in delete if sid not in doomed)
+        if doomed:
+            # One pass for the whole batch instead of one shifting del per id.
+            strategies[:] = [s for s in strategies if s.get("strategy_id") not in doomed]
+        strategies.extend(copy.deepcopy(create))
+        result["created"] = [s["strategy_id"] for s in create]
+        changed = bool(result["updated"] or doomed or create)
+        return result, changed
+
+    return _mutate_strategies(_apply)
+
+
+# Field order here is the order written to business_config.json (after "name").
+# The payload is only serialized, never mutated, so sharing the empty list is safe.
+_BUSINESS_CONFIG_DEFAULTS: dict[str, Any] = {
+    "business_description": "",
+    "budget": 0,
+    "enable_budget_alerts": False,
+    "allowed_campaign_channels": [],
+}
+
+
+def _business_config_payload(config: dict[str, Any]) -> dict[str, Any]:
     name = (config.get("name") or "").strip() if isinstance(config.get("name"), str) else None
     if not name:
         raise ValueError("config must include a non-empty 'name' field")
 
-    if _blob_exists(BUSINESS_CONFIG_PROJECT, BUSINESS_CONFIG_BUCKET, filename):
-        raise FileExistsError(f"file already exists: gs://{BUSINESS_CONFIG_BUCKET}/{filename}")
+    payload = {"name": name, **_BUSINESS_CONFIG_DEFAULTS}
+    payload.update({k: config[k] for k in _BUSINESS_CONFIG_DEFAULTS if k in config})
+    payload["enable_budget_alerts"] = bool(payload["enable_budget_alerts"])
+    return payload
 
-    payload = {
-        "name": name,
-        "business_description": config.get("business_description", ""),
-        "budget": config.get("budget", 0),
-        "enable_budget_alerts": bool(config.get("enable_budget_alerts", False)),
-        "allowed_campaign_channels": config.get("allowed_campaign_channels", []),
-    }
 
-    bucket = _ensure_bucket_exists(BUSINESS_CONFIG_PROJECT, BUSINESS_CONFIG_BUCKET)
+def _upload_new_file(bucket: storage.Bucket, filename: str, payload: Any) -> int:
+    """Upload a JSON file that must not exist yet and return its generation."""
     blob = bucket.blob(filename)
-    blob.upload_from_string(json.dumps(payload, indent=2), content_type="application/json")
+    # if_generation_match=0: create-only, so the existence check rides on the upload itself.
+    try:
+        blob.upload_from_string(payload, content_type="application/json", if_generation_match=0)
+    except PreconditionFailed:
+        raise FileExistsError(f"file already exists: gs://{bucket.name}/{filename}") from None
+    return blob.generation
+
+
+def _write_strategy_file(filename: str) -> str:
+    bucket = _ensure_bucket_exists(STRATEGIES_PROJECT, STRATEGIES_BUCKET)
+    _upload_new_file(bucket, filename, _EMPTY_ARRAY_BYTES)
+
+    return f"gs://{STRATEGIES_BUCKET}/{filename}"
+
+
+def _write_business_config_file(payload: dict[str, Any], filename: str) -> str:
+    bucket = _ensure_bucket_exists(BUSINESS_CONFIG_PROJECT, BUSINESS_CONFIG_BUCKET)
+    _upload_new_file(bucket, filename, _json_dumps(payload))
 
-    return f"gs://{BUSINESS_CONFIG_BUCKET}/{filename}"
\ No newline at end of file
+    return f"gs://{BUSINESS_CONFIG_BUCKET}/{filename}"
+
+
+def create_strategy_file(filename: str = "strategies.json") -> str:
+    if not STRATEGIES_BUCKET:
+        raise OSError("STRATEGIES_JSON_BUCKET is not set")
+
+    return _write_strategy_file(filename)
+
+
+def create_business_config_file(config: dict[str, Any], filename: str = "business_config.json") -> str:
+    if not BUSINESS_CONFIG_BUCKET:
+        raise OSError("BUSINESS_CONFIIG_JSON_BUCKET is not set")
+
+    payload = _business_config_payload(config)
+
+    return _write_business_config_file(payload, filename)
+
+
+def create_all_files(
+    config: dict[str, Any],
+    strategies_filename: str = "strategies.json",
+    business_config_filename: str = "business_config.json",
+) -> dict[str, str]:
+    """
+    Initialize both the strategies file and the business config file.
+
+    Both uploads are create-only. If the business config cannot be written, the
+    strategies file created by this call is removed again, so nothing is left
+    half-initialized when either file already exists.
+
+    Args:
+        config: business config; same rules as create_business_config_file.
+        strategies_filename: object name for the strategies file.
+        business_config_filename: object name for the business config file.
+
+    Returns:
+        {"strategies": gs:// URI, "business_config": gs:// URI}
+    """
+    if not STRATEGIES_BUCKET:
+        raise OSError("STRATEGIES_JSON_BUCKET is not set")
+    if not BUSINESS_CONFIG_BUCKET:
+        raise OSError("BUSINESS_CONFIIG_JSON_BUCKET is not set")
+
+    payload = _business_config_payload(config)
+
+    strategies_bucket = _ensure_bucket_exists(STRATEGIES_PROJECT, STRATEGIES_BUCKET)
+    generation = _upload_new_file(strategies_bucket, strategies_filename, _EMPTY_ARRAY_BYTES)
+    try:
+        business_config_uri = _write_business_config_file(payload, business_config_filename)
+    except Exception:
+        # Only delete the version this call wrote; a concurrent writer's file stays.
+        with contextlib.suppress(NotFound, PreconditionFailed):
+            strategies_bucket.blob(strategies_filename).delete(if_generation_match=generation)
+        raise
+
+    return {
+        "strategies": f"gs://{STRATEGIES_BUCKET}/{strategies_filename}",
+        "business_config": business_config_uri,
+    }
@@ -2,6 +2,8 @@
 Top level tools for Promosphere
 """
 
+import logging
+
 from google.adk.tools import ToolContext
 from google.adk.tools.agent_tool import AgentTool
 import json
@@ -9,22 +11,27 @@ from typing import List
 # from .sub_agents import data_analysis, db_agent
 from .sub_agents import data_analysis_agent, resource_agent, search_agent, storage_agent
 
+log = logging.getLogger(__name__)
+
+_DATA_ANALYSIS_TOOL = AgentTool(agent=data_analysis_agent)
+_RESOURCE_TOOL = AgentTool(agent=resource_agent)
+_SEARCH_TOOL = AgentTool(agent=search_agent)
+_STORAGE_TOOL = AgentTool(agent=storage_agent)
+
 
 async def call_data_analytics_agent(
     question: str,
     tool_context: ToolContext,
 ):
     """Tool to call data analysis agent."""
-    print("\ncall_data_analytics_agent:")
+    log.debug("call_data_analytics_agent")
 
-    agent_tool = AgentTool(agent=data_analysis_agent)
-
-    da_agent_output = await agent_tool.run_async(
+    da_agent_output = await _DATA_ANALYSIS_TOOL.run_async(
         args={"request": question}, tool_context=tool_context
     )
 
     tool_context.state["da_agent_output"] = da_agent_output
-    print("da agent output =", da_agent_output)
+    log.debug("da agent output = %s", da_agent_output)
     return da_agent_output
 
 
@@ -42,14 +49,14 @@ async def call_resource_agent(
                  - "Fetch document 'user_123' from 'users' collection"
                  - "Update field 'status' to 'active' in document 'user_123' in collection 'users'"
     """
-    print("\ncall_resource_agent with request:", request)
-    agent_tool = AgentTool(agent=resource_agent)
-    resource_agent_output = await agent_tool.run_async(
+    log.debug("call_resource_agent with request: %s", request)
+    resource_agent_output = await _RESOURCE_TOOL.run_async(
         args={"request": request}, tool_context=tool_context
     )
     tool_context.state["resource_agent_output"] = resource_agent_output
-    print("resource_agent_output =", resource_agent_output)
-    return resource_agent_output   
+    log.debug("resource_agent_output = %s", resource_agent_output)
+    return resource_agent_output
+
 
 async def call_search_agent(
     request: str,
@@ -64,13 +71,12 @@ async def call_search_agent(
                  - "What are current EU SMS marketing regulations in 2025?"
                  - "Summarize competitor loyalty strategies."
     """
-    print("\ncall_search_agent with request:", request)
-    agent_tool = AgentTool(agent=search_agent)
-    search_agent_output = await agent_tool.run_async(
+    log.debug("call_search_agent with request: %s", request)
+    search_agent_output = await _SEARCH_TOOL.run_async(
         args={"request": request}, tool_context=tool_context
     )
     tool_context.state["search_agent_output"] = search_agent_output
-    print("search_agent_output =", search_agent_output)
+    log.debug("search_agent_output = %s", search_agent_output)
     return search_agent_output
 
 
@@ -79,14 +85,12 @@ async def call_storage_agent(
     tool_context: ToolContext,
 ):
     """Tool to call storage agent."""
-    print("\ncall_storage_agent with intent =", intent)
-
-    agent_tool = AgentTool(agent=storage_agent)
+    log.debug("call_storage_agent with intent = %s", intent)
 
-    storage_agent_output = await agent_tool.run_async(
+    storage_agent_output = await _STORAGE_TOOL.run_async(
         args={"request": intent}, tool_context=tool_context
     )
 
     tool_context.state["storage_agent_output"] = storage_agent_output
-    print("storage agent output =", storage_agent_output)
+    log.debug("storage agent output = %s", storage_agent_output)
     return storage_agent_output
\ No newline at end of file
@@ -0,0 +1,26 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared generation configs for the agent tree.
+
+ADK deep-copies an agent's generate_content_config into each LlmRequest, so a
+single instance can safely back every agent with the same settings.
+"""
+
+from google.genai import types
+
+# Deterministic tool-driven sub-agents (CLI, storage, resource, data analysis).
+GEN_CFG_LOW = types.GenerateContentConfig(temperature=0.01)
+# Conversational root agent.
+GEN_CFG_MED = types.GenerateContentConfig(temperature=0.3)
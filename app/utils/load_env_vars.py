@@ -6,22 +6,25 @@ log = logging.getLogger(__name__)
 
 def load_env_vars(file_path: str) -> int:
     p = pathlib.Path(file_path)
-    if not p.exists():
+    try:
+        # One read + splitlines instead of iterating the text wrapper line by line.
+        text = p.read_text()
+    except FileNotFoundError:
         log.warning("[env] File not found: %s (skipping)", file_path)
         return 0
 
-    count = 0
-    with p.open("r") as f:
-        for raw in f:
-            line = raw.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key, value = key.strip(), value.strip()
-            if value.startswith(("'", '"')) and value.endswith(("'", '"')):
-                value = value[1:-1]
-            os.environ[key] = value
-            count += 1
+    pairs: dict[str, str] = {}
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        key, value = key.strip(), value.strip()
+        if value.startswith(("'", '"')) and value.endswith(("'", '"')):
+            value = value[1:-1]
+        pairs[key] = value
 
-    log.info("✅ Loaded %d env vars from %s", count, file_path)
-    return count
\ No newline at end of file
+    # Applied in one update; a key repeated in the file keeps its last value, as before.
+    os.environ.update(pairs)
+    log.info("✅ Loaded %d env vars from %s", len(pairs), file_path)
+    return len(pairs)
\ No newline at end of file
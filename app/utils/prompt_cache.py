@@ -0,0 +1,153 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import os
+import time
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import Client, types
+
+logger = logging.getLogger(__name__)
+
+ENABLE_PROMPT_CACHE = os.getenv("ENABLE_PROMPT_CACHE", "0") == "1"
+PROMPT_CACHE_TTL_SECONDS = int(os.getenv("PROMPT_CACHE_TTL_SECONDS", "3600"))
+# Extend the cache this long before it would expire so requests never race it.
+_REFRESH_MARGIN_SECONDS = 300
+# After a failed create (prompt under the minimum size, quota, ...) send requests
+# inline for this long before trying again, doubling up to the cache TTL.
+PROMPT_CACHE_RETRY_SECONDS = int(os.getenv("PROMPT_CACHE_RETRY_SECONDS", "300"))
+
+
+class PromptCache:
+    """
+    Keeps an agent's system instruction and tool declarations in a Vertex AI
+    explicit context cache and points every model request at it.
+
+    Gemini rejects requests that set `cached_content` together with
+    `system_instruction` or `tools`, so both are moved into the cache on the
+    first call and stripped from subsequent requests. Any failure falls back
+    to sending the request inline, and creation is not retried until the
+    backoff window has passed. Create/extend RPCs use the async client, so a
+    slow call never blocks the event loop for other sessions.
+    """
+
+    def __init__(
+        self,
+        display_name: str,
+        ttl_seconds: int = PROMPT_CACHE_TTL_SECONDS,
+    ) -> None:
+        self.display_name = display_name
+        self.ttl_seconds = ttl_seconds
+        self._client: Client | None = None
+        # Created on first use so it binds to the loop that actually serves requests.
+        self._lock: asyncio.Lock | None = None
+        self._name: str | None = None
+        self._key: tuple[str, str, str] | None = None
+        self._expires_at = 0.0
+        self._retry_at = 0.0
+        self._retry_delay = float(PROMPT_CACHE_RETRY_SECONDS)
+
+    def _get_client(self) -> Client:
+        if self._client is None:
+            self._client = Client(
+                vertexai=True,
+                project=os.getenv("GOOGLE_CLOUD_PROJECT"),
+                location=os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
+            )
+        return self._client
+
+    async def _create(self, model: str, config: types.GenerateContentConfig) -> str:
+        cache = await self._get_client().aio.caches.create(
+            model=model,
+            config=types.CreateCachedContentConfig(
+                display_name=self.display_name,
+                system_instruction=config.system_instruction,
+                tools=config.tools,
+                tool_config=config.tool_config,
+                ttl=f"{self.ttl_seconds}s",
+            ),
+        )
+        logger.info("[prompt_cache] Created %s for %s", cache.name, self.display_name)
+        return cache.name
+
+    async def _refresh(self, name: str) -> None:
+        await self._get_client().aio.caches.update(
+            name=name,
+            config=types.UpdateCachedContentConfig(ttl=f"{self.ttl_seconds}s"),
+        )
+        logger.info("[prompt_cache] Extended %s", name)
+
+    def _fresh_name(self, key: tuple[str, str, str], now: float) -> str | None:
+        if self._name and self._key == key and now < self._expires_at - _REFRESH_MARGIN_SECONDS:
+            return self._name
+        return None
+
+    async def get_or_create(
+        self, model: str, config: types.GenerateContentConfig
+    ) -> str | None:
+        """Return the cache name for this model/config, creating or extending it."""
+        key = (model, str(config.system_instruction), repr(config.tools))
+        now = time.monotonic()
+        # Fast path without the lock: a live cache, or a recent failure to back off from.
+        name = self._fresh_name(key, now)
+        if name or now < self._retry_at:
+            return name
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            name = self._fresh_name(key, now)
+            if name or now < self._retry_at:
+                return name  # another request already did the work
+            if self._name and self._key == key:
+                try:
+                    await self._refresh(self._name)
+                    self._expires_at = now + self.ttl_seconds
+                    return self._name
+                except Exception as e:
+                    logger.warning("[prompt_cache] Refresh failed, recreating: %s", e)
+            try:
+                self._name = await self._create(model, config)
+                self._key = key
+                self._expires_at = now + self.ttl_seconds
+                self._retry_delay = float(PROMPT_CACHE_RETRY_SECONDS)
+            except Exception as e:
+                logger.warning(
+                    "[prompt_cache] Creation failed, sending inline for %.0fs: %s",
+                    self._retry_delay,
+                    e,
+                )
+                self._name = None
+                self._key = None
+                self._retry_at = now + self._retry_delay
+                self._retry_delay = min(self._retry_delay * 2, float(self.ttl_seconds))
+            return self._name
+
+    async def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> LlmResponse | None:
+        """ADK before_model_callback that swaps the inline prompt for the cache."""
+        config = llm_request.config
+        if config is None or not config.system_instruction or not llm_request.model:
+            return None
+        name = await self.get_or_create(llm_request.model, config)
+        if name:
+            config.cached_content = name
+            config.system_instruction = None
+            config.tools = None
+            config.tool_config = None
+        return None
@@ -0,0 +1,131 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+from google.genai import Client
+
+logger = logging.getLogger(__name__)
+
+ENABLE_SEMANTIC_CACHE = os.getenv("ENABLE_SEMANTIC_CACHE", "0") == "1"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_CACHE_MODEL = os.getenv("SEMANTIC_CACHE_MODEL", "text-embedding-004")
+
+# Tokens that pin down *which* resource a request is about: flags, regions,
+# zones, ids, versions. Embeddings barely move when one of these changes.
+_LITERAL_TOKEN = re.compile(r"--?[\w-]+(?:=\S+)?|\S*\d\S*|\w+(?:-\w+)+")
+
+
+def _literal_tokens(text: str) -> frozenset[str]:
+    return frozenset(_LITERAL_TOKEN.findall(text.lower()))
+
+
+class SemanticCache:
+    """
+    In-process LRU of (embedding, response) pairs that answers paraphrased
+    requests with a previous response when cosine similarity clears a threshold.
+
+    Embeddings are L2-normalised on insert so similarity is a single matrix
+    dot product. Embedding failures simply disable the cache for that call.
+    Entries expire after `ttl_seconds`, and a hit also requires the same literal
+    tokens (flags, regions, ids), so "... in us-central1" never answers
+    "... in europe-west1".
+    """
+
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        maxsize: int = 512,
+        model: str = SEMANTIC_CACHE_MODEL,
+        enabled: bool = ENABLE_SEMANTIC_CACHE,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.model = model
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self._client: Client | None = None
+        # id -> (embedding, literal tokens, monotonic insert time, response), oldest first
+        self._entries: OrderedDict[int, tuple[np.ndarray, frozenset[str], float, Any]] = (
+            OrderedDict()
+        )
+        self._next_id = 0
+
+    def _get_client(self) -> Client:
+        if self._client is None:
+            self._client = Client(
+                vertexai=True,
+                project=os.getenv("GOOGLE_CLOUD_PROJECT"),
+                location=os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1"),
+            )
+        return self._client
+
+    async def embed(self, text: str) -> np.ndarray | None:
+        """Return the normalised embedding of `text`, or None if unavailable."""
+        if not self.enabled:
+            return None
+        try:
+            resp = await self._get_client().aio.models.embed_content(
+                model=self.model, contents=text
+            )
+            vector = np.asarray(resp.embeddings[0].values, dtype=np.float32)
+        except Exception as e:
+            logger.warning("[semantic_cache] Embedding failed, skipping cache: %s", e)
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    def _expire(self, now: float) -> None:
+        if self.ttl_seconds is None:
+            return
+        # Insertion order is age order except for LRU bumps, so scan every entry.
+        expired = [i for i, entry in self._entries.items() if now - entry[2] >= self.ttl_seconds]
+        for entry_id in expired:
+            del self._entries[entry_id]
+
+    def lookup(self, embedding: np.ndarray | None, text: str) -> Any | None:
+        """Return the cached response for `text` most similar to `embedding` above the threshold."""
+        if embedding is None:
+            return None
+        self._expire(time.monotonic())
+        literals = _literal_tokens(text)
+        ids = [i for i, entry in self._entries.items() if entry[1] == literals]
+        if not ids:
+            return None
+        matrix = np.stack([self._entries[i][0] for i in ids])
+        scores = matrix @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        entry_id = ids[best]
+        self._entries.move_to_end(entry_id)
+        logger.info("[semantic_cache] Hit (similarity=%.3f)", float(scores[best]))
+        return self._entries[entry_id][3]
+
+    def add(self, embedding: np.ndarray | None, text: str, response: Any) -> None:
+        if embedding is None:
+            return
+        self._entries[self._next_id] = (
+            embedding, _literal_tokens(text), time.monotonic(), response
+        )
+        self._next_id += 1
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
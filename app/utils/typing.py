@@ -35,6 +35,14 @@ class Request(BaseModel):
     model_config = {"extra": "allow"}
 
 
+class StreamRequest(BaseModel):
+    """Body of a /stream call: one new message, optionally continuing a session."""
+
+    message: Content
+    user_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    session_id: str | None = None
+
+
 class Feedback(BaseModel):
     """Represents feedback for a conversation."""
 
@@ -0,0 +1,143 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Shared fixtures for unit tests that exercise app modules without GCP access."""
+
+import itertools
+import os
+import pathlib
+import sys
+import types
+from typing import Any
+
+import pytest
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+APP_DIR = pathlib.Path(__file__).resolve().parents[2] / "app"
+
+# Module-level config the app reads at import time.
+for _key, _value in {
+    "GENERIC_MODEL": "gemini-2.5-flash",
+    "RESOURCE_REGISTRY_BUCKET": "test-registry",
+    "STRATEGIES_JSON_BUCKET": "test-strategies",
+    "STRATEGIES_JSON_FILE": "strategies.json",
+    "BUSINESS_CONFIIG_JSON_BUCKET": "test-config",
+    "BUSINESS_CONFIIG_JSON_FILE": "business_config.json",
+}.items():
+    os.environ.setdefault(_key, _value)
+
+# These package __init__s build every agent (some of which call Vertex AI at
+# construction); register them as bare packages so their submodules import alone.
+for _name in ("app.sub_agents", "app.sub_agents.data_analysis.sub_agents"):
+    if _name not in sys.modules:
+        _pkg = types.ModuleType(_name)
+        _pkg.__path__ = [str(APP_DIR.joinpath(*_name.split(".")[1:]))]
+        sys.modules[_name] = _pkg
+
+# Sibling tool modules wrap agents from the bare package; give them inert stand-ins.
+for _name, _agent in (
+    ("app.sub_agents", "cli_agent"),
+    ("app.sub_agents.data_analysis.sub_agents", "data_analyzer_agent"),
+    ("app.sub_agents.data_analysis.sub_agents", "db_query_agent"),
+):
+    if not hasattr(sys.modules[_name], _agent):
+        from google.adk.agents import BaseAgent
+
+        setattr(sys.modules[_name], _agent, BaseAgent(name=_agent))
+
+
+class FakeBlob:
+    """The slice of google.cloud.storage.Blob the app uses, backed by FakeGCS."""
+
+    def __init__(self, gcs: "FakeGCS", bucket: str, name: str):
+        self._gcs, self._key, self.name = gcs, (bucket, name), name
+        self.content_encoding: str | None = None
+        stored = gcs.objects.get(self._key)
+        self.generation: int | None = stored[1] if stored else None
+
+    def _check(self, if_generation_match: int | None) -> None:
+        current = self._gcs.objects.get(self._key)
+        if (
+            if_generation_match is not None
+            and (current[1] if current else 0) != if_generation_match
+        ):
+            raise PreconditionFailed(f"gs://{self._key[0]}/{self.name}")
+
+    def upload_from_string(
+        self, data: Any, content_type: str = "", if_generation_match: int | None = None
+    ) -> None:
+        self._check(if_generation_match)
+        self._gcs.uploads.append(self._key)
+        self.generation = next(self._gcs.generations)
+        body = data.encode("utf-8") if isinstance(data, str) else bytes(data)
+        self._gcs.objects[self._key] = (body, self.generation)
+
+    def download_as_bytes(self) -> bytes:
+        if self._key not in self._gcs.objects:
+            raise NotFound(f"gs://{self._key[0]}/{self.name}")
+        self._gcs.downloads += 1
+        return self._gcs.objects[self._key][0]
+
+    def delete(self, if_generation_match: int | None = None) -> None:
+        if self._key not in self._gcs.objects:
+            raise NotFound(f"gs://{self._key[0]}/{self.name}")
+        self._check(if_generation_match)
+        del self._gcs.objects[self._key]
+
+
+class FakeBucket:
+    def __init__(self, gcs: "FakeGCS", name: str):
+        self._gcs, self.name = gcs, name
+
+    def blob(self, name: str) -> FakeBlob:
+        return FakeBlob(self._gcs, self.name, name)
+
+    def get_blob(self, name: str) -> FakeBlob | None:
+        if self._gcs.get_blob_error is not None:
+            raise self._gcs.get_blob_error
+        self._gcs.metadata_gets += 1
+        blob = FakeBlob(self._gcs, self.name, name)
+        return blob if blob.generation is not None else None
+
+
+class FakeGCS:
+    """In-memory object store standing in for the storage.Client."""
+
+    def __init__(self) -> None:
+        self.objects: dict[tuple[str, str], tuple[bytes, int]] = {}
+        self.generations = itertools.count(1)
+        self.uploads: list = []
+        self.metadata_gets = 0
+        self.downloads = 0
+        self.get_blob_error: Exception | None = None
+
+    def bucket(self, name: str) -> FakeBucket:
+        return FakeBucket(self, name)
+
+    get_bucket = bucket
+
+    def put(self, bucket: str, name: str, body: bytes) -> int:
+        generation = next(self.generations)
+        self.objects[(bucket, name)] = (body, generation)
+        return generation
+
+
+@pytest.fixture
+def fake_gcs(monkeypatch: pytest.MonkeyPatch) -> FakeGCS:
+    """Route every storage-utils GCS call to a fresh in-memory store."""
+    from app.sub_agents.storage import utils as storage_utils
+
+    gcs = FakeGCS()
+    monkeypatch.setattr(storage_utils, "_get_storage_client", lambda project=None: gcs)
+    monkeypatch.setattr(storage_utils, "_STRATEGIES_CACHE", {})
+    return gcs
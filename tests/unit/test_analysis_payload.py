@@ -0,0 +1,51 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Rows serialized into the analyzer prompt stay within the byte budget."""
+
+import decimal
+import json
+
+import pytest
+
+from app.sub_agents.data_analysis import tools
+
+
+def test_small_result_is_plain_compact_json() -> None:
+    rows = [{"city": "Zürich", "revenue": decimal.Decimal("1.50")}]
+
+    assert tools._rows_to_json(rows) == '[{"city":"Zürich","revenue":"1.50"}]'
+
+
+def test_large_result_is_truncated_to_whole_rows(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(tools, "MAX_ANALYSIS_BYTES", 100)
+    rows = [{"n": n, "city": "Zürich"} for n in range(50)]
+
+    payload, note = tools._rows_to_json(rows).split("\n", 1)
+
+    assert len(payload.encode("utf-8")) <= 100
+    assert json.loads(payload) == rows[: len(json.loads(payload))]
+    assert "of 50 rows" in note
+
+
+def test_oversize_row_is_cut_on_a_character_boundary(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(tools, "MAX_ANALYSIS_BYTES", 10)
+
+    payload, note = tools._rows_to_json([{"city": "ü" * 20}]).split("\n", 1)
+
+    assert len(payload.encode("utf-8")) <= 10
+    assert "incomplete" in note
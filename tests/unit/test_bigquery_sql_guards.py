@@ -0,0 +1,73 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Read-only guard and SQL cleanup used before BigQuery validation runs a query."""
+
+import re
+
+import pytest
+
+from app.sub_agents.data_analysis.sub_agents.bigquery import tools
+
+# The regex the token scan replaced; both must flag exactly the same queries.
+DML_RE = re.compile(r"(?i)\b(update|delete|drop|insert|create|alter|truncate|merge)\b")
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT * FROM sales",
+        "SELECT updated_at, created_by FROM orders",
+        "SELECT `deleted` FROM t",
+        "select * from t; DELETE FROM t",
+        "Drop TABLE t",
+        "MERGE INTO t USING s ON TRUE",
+        "insert\tinto t values (1)",
+        "SELECT 1 -- update me",
+        "",
+    ],
+)
+def test_disallowed_dml_matches_word_boundary_regex(sql: str) -> None:
+    assert tools._contains_disallowed_dml(sql) == bool(DML_RE.search(sql))
+
+
+def _chained_replace(raw: str) -> str:
+    # The original cleanup: four str.replace passes in this order.
+    return (
+        raw.replace('\\"', '"')
+        .replace("\\\n", "\n")
+        .replace("\\'", "'")
+        .replace("\\n", "\n")
+    )
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "SELECT 1 LIMIT 5",
+        "SELECT \\\"a\\\" FROM t\\nWHERE b = \\'x\\' LIMIT 1",
+        "SELECT a\\\nFROM t limit 3",
+        "SELECT '\\\\n' LIMIT 2",
+    ],
+)
+def test_cleanup_unescapes_like_chained_replace(raw: str) -> None:
+    assert tools._cleanup_sql(raw) == _chained_replace(raw).strip()
+
+
+def test_cleanup_appends_limit_only_when_missing() -> None:
+    assert tools._cleanup_sql("  SELECT 1  ") == f"SELECT 1 limit {tools.MAX_NUM_ROWS}"
+    assert tools._cleanup_sql("select 1 LIMIT 10") == "select 1 LIMIT 10"
+    # Whole word only: a column named "unlimited" is not a LIMIT clause.
+    assert tools._cleanup_sql("SELECT unlimited FROM t").endswith(
+        f" limit {tools.MAX_NUM_ROWS}"
+    )
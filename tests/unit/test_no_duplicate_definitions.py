@@ -0,0 +1,54 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Guards against modules that define (and register) the same thing twice."""
+
+import ast
+import collections
+import pathlib
+
+import pytest
+
+APP_DIR = pathlib.Path(__file__).resolve().parents[2] / "app"
+
+MODULES = [
+    "tools.py",
+    "utils/load_env_vars.py",
+    "sub_agents/storage/prompts.py",
+    "sub_agents/storage/tools.py",
+    "sub_agents/storage/utils.py",
+]
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_top_level_names_defined_once(module: str) -> None:
+    """A later def would silently replace the earlier one at import."""
+    body = ast.parse((APP_DIR / module).read_text(encoding="utf-8")).body
+    names = collections.Counter(
+        node.name
+        for node in body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    )
+    for node in body:
+        # Module-level tool lists: each tool registered once.
+        if (
+            isinstance(node, ast.Assign)
+            and isinstance(node.targets[0], ast.Name)
+            and isinstance(node.value, ast.List)
+        ):
+            names.update(
+                f"{node.targets[0].id}[{elt.id}]"
+                for elt in node.value.elts
+                if isinstance(elt, ast.Name)
+            )
+    assert [name for name, count in names.items() if count > 1] == []
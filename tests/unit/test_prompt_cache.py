@@ -0,0 +1,58 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""PromptCache: failed cache creation is not retried on every model call."""
+
+import asyncio
+import types as pytypes
+
+from google.genai import types
+
+from app.utils.prompt_cache import PromptCache
+
+CONFIG = types.GenerateContentConfig(system_instruction="You are PromoSphere.")
+
+
+def _cache_with(create) -> PromptCache:
+    cache = PromptCache(display_name="test")
+    caches = pytypes.SimpleNamespace(create=create)
+    cache._client = pytypes.SimpleNamespace(aio=pytypes.SimpleNamespace(caches=caches))
+    return cache
+
+
+def test_failed_create_backs_off() -> None:
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        raise RuntimeError("cached content is too small")
+
+    cache = _cache_with(create)
+
+    async def two_requests():
+        return [await cache.get_or_create("gemini-2.5-flash", CONFIG) for _ in range(2)]
+
+    assert asyncio.run(two_requests()) == [None, None]
+    assert len(calls) == 1
+
+
+def test_created_cache_is_reused() -> None:
+    async def create(**kwargs):
+        return pytypes.SimpleNamespace(name="cachedContents/1")
+
+    cache = _cache_with(create)
+
+    async def two_requests():
+        return [await cache.get_or_create("gemini-2.5-flash", CONFIG) for _ in range(2)]
+
+    assert asyncio.run(two_requests()) == ["cachedContents/1"] * 2
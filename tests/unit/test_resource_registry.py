@@ -0,0 +1,91 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""GCS-backed resource registry: compare-and-swap writes against FakeGCS."""
+
+import gzip
+import json
+
+import pytest
+from google.api_core.exceptions import ServiceUnavailable
+
+from app.sub_agents.resource.utils import utils as registry
+from app.sub_agents.storage import utils as storage_utils
+
+BLOB = (registry.RESOURCE_REGISTRY_BUCKET, registry.RESOURCE_REGISTRY_FILE)
+
+
+@pytest.fixture
+def gcs(fake_gcs, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(registry, "_REGISTRY_CACHE", None)
+    monkeypatch.setattr(registry, "_REGISTRY_GENERATION", None)
+    monkeypatch.setattr(registry, "_TYPE_INDEX", None)
+    monkeypatch.setattr(storage_utils, "_backoff", lambda attempt: None)
+    return fake_gcs
+
+
+def _stored(gcs) -> dict:
+    return json.loads(gzip.decompress(gcs.objects[BLOB][0]))
+
+
+def _resource(resource_id: str) -> dict:
+    return {"id": resource_id, "type": "storage_bucket", "name": resource_id}
+
+
+def test_concurrent_write_is_replayed_not_lost(gcs, monkeypatch) -> None:
+    registry.add_resource(_resource("a"))
+    upload = registry.gcs_upload_json
+
+    def racing_upload(*args, **kwargs):
+        # Another instance commits "b" between our load and our upload, once.
+        monkeypatch.setattr(registry, "gcs_upload_json", upload)
+        theirs = _stored(gcs)
+        theirs["resources"].append(_resource("b"))
+        gcs.put(*BLOB, gzip.compress(json.dumps(theirs).encode()))
+        return upload(*args, **kwargs)
+
+    monkeypatch.setattr(registry, "gcs_upload_json", racing_upload)
+    registry.add_resource(_resource("c"))
+
+    assert [r["id"] for r in _stored(gcs)["resources"]] == ["a", "b", "c"]
+
+
+def test_read_error_does_not_overwrite_registry(gcs) -> None:
+    registry.add_resource(_resource("a"))
+    before = gcs.objects[BLOB]
+    gcs.get_blob_error = ServiceUnavailable("backend unavailable")
+
+    with pytest.raises(ServiceUnavailable):
+        registry.add_resource(_resource("b"))
+
+    assert gcs.objects[BLOB] == before
+
+
+def test_own_write_refreshes_cache_without_download(gcs) -> None:
+    registry.add_resource(_resource("a"))
+    registry.add_resource(_resource("b"))
+    downloads = gcs.downloads
+
+    assert [r["id"] for r in registry.list_resources()] == ["a", "b"]
+    assert [r["id"] for r in registry.list_resources("storage_bucket")] == ["a", "b"]
+    assert gcs.downloads == downloads
+
+
+@pytest.mark.parametrize("pretty", [True, False])
+def test_resources_json_round_trips(gcs, pretty: bool) -> None:
+    registry.add_resource(_resource("a"))
+
+    text = registry.get_resources_json(pretty=pretty)
+
+    assert json.loads(text)["resources"] == registry.list_resources()
+    assert ("\n" in text) is pretty
@@ -0,0 +1,136 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Firestore resource tools against an in-memory stand-in for the client."""
+
+import asyncio
+import types
+from typing import Any
+
+import pytest
+
+from app.sub_agents.resource import tools
+from app.sub_agents.resource.utils.firestore import dao
+
+
+class FakeBulkWriter:
+    """Fails every write to the ids in `failing`, like a persistent server error."""
+
+    def __init__(self, written: dict[str, Any], failing: set[str]):
+        self._written, self._failing = written, failing
+        self._on_result = self._on_error = None
+        self._pending: list[tuple[Any, dict[str, Any]]] = []
+
+    def on_write_result(self, callback: Any) -> None:
+        self._on_result = callback
+
+    def on_write_error(self, callback: Any) -> None:
+        self._on_error = callback
+
+    def set(self, reference: Any, document: dict[str, Any]) -> None:
+        self._pending.append((reference, document))
+
+    def close(self) -> None:
+        for reference, document in self._pending:
+            attempts = 0
+            while reference.id in self._failing:
+                attempts += 1
+                failure = types.SimpleNamespace(
+                    operation=types.SimpleNamespace(reference=reference),
+                    attempts=attempts,
+                    code=14,
+                    message="unavailable",
+                )
+                if not self._on_error(failure, self):
+                    break
+            else:
+                self._written[reference.id] = document
+                self._on_result(reference, None, self)
+
+
+class FakeFirestore:
+    def __init__(self, failing: set[str] = frozenset()):
+        self.written: dict[str, Any] = {}
+        self.writers: list[FakeBulkWriter] = []
+        self._failing = set(failing)
+        self._auto_ids = iter(f"auto-{n}" for n in range(1000))
+
+    def collection(self, name: str) -> Any:
+        def document(doc_id: str | None = None) -> Any:
+            return types.SimpleNamespace(id=doc_id or next(self._auto_ids))
+
+        return types.SimpleNamespace(document=document)
+
+    def bulk_writer(self) -> FakeBulkWriter:
+        writer = FakeBulkWriter(self.written, self._failing)
+        self.writers.append(writer)
+        return writer
+
+
+def _bulk_create(client: FakeFirestore, monkeypatch: pytest.MonkeyPatch, **kwargs):
+    monkeypatch.setattr(dao, "_get_client", lambda: client)
+    return asyncio.run(tools.fs_bulk_create_documents(collection="c", **kwargs))
+
+
+def test_bulk_create_reports_written_ids(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = FakeFirestore()
+    result = _bulk_create(
+        client, monkeypatch, documents=[{"n": 1}, {"n": 2}], document_ids=["a"]
+    )
+    assert result == {"status": "success", "document_ids": ["a", "auto-0"]}
+    assert client.written == {"a": {"n": 1}, "auto-0": {"n": 2}}
+
+
+def test_bulk_create_reports_dropped_writes(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = FakeFirestore(failing={"b"})
+    result = _bulk_create(
+        client,
+        monkeypatch,
+        documents=[{"n": 1}, {"n": 2}, {"n": 3}],
+        document_ids=["a", "b", "c"],
+    )
+    assert result["status"] == "error"
+    assert result["document_ids"] == ["a", "c"]
+    assert result["failed_ids"] == ["b"]
+    assert "unavailable" in result["error_message"]
+    assert set(client.written) == {"a", "c"}
+
+
+@pytest.mark.parametrize(
+    ("new_value", "stored"),
+    [
+        ("42", 42),
+        ('{"nested": 1}', {"nested": 1}),
+        ("Amsterdam", "Amsterdam"),
+        ("[not json", "[not json"),
+        (42, 42),
+        (True, True),
+        ({"nested": 1}, {"nested": 1}),
+    ],
+)
+def test_update_field_decodes_json_text_only(
+    monkeypatch: pytest.MonkeyPatch, new_value: Any, stored: Any
+) -> None:
+    updates: list[Any] = []
+    monkeypatch.setattr(
+        tools, "_update_document_field", lambda **kwargs: updates.append(kwargs)
+    )
+    result = asyncio.run(
+        tools.fs_update_document_field(
+            collection="c", document_id="d", field_name="f", new_value=new_value
+        )
+    )
+    assert result["status"] == "success"
+    assert updates == [
+        {"collection": "c", "document_id": "d", "field_name": "f", "new_value": stored}
+    ]
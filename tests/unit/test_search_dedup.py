@@ -0,0 +1,82 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""call_search_agent: identical requests share one search run."""
+
+import asyncio
+import types
+from collections import OrderedDict
+
+import pytest
+
+from app.sub_agents.cli import tools
+
+
+class FakeSearchTool:
+    def __init__(self, error: Exception | None = None):
+        self.calls: list[dict] = []
+        self.error = error
+
+    async def run_async(self, *, args, tool_context):
+        self.calls.append(args)
+        await asyncio.sleep(0)  # let the other callers queue up behind us
+        if self.error is not None:
+            raise self.error
+        return f"answer to {args['request']}"
+
+
+@pytest.fixture
+def search(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(tools, "_search_cache", OrderedDict())
+    monkeypatch.setattr(tools, "_search_inflight", {})
+    monkeypatch.setattr(tools, "_search_lock", None)
+    monkeypatch.setattr(tools._semantic_search_cache, "enabled", False)
+    fake = FakeSearchTool()
+    monkeypatch.setattr(tools, "_SEARCH_AGENT_TOOL", fake)
+    return fake
+
+
+def _call(*requests: str) -> list:
+    async def run():
+        contexts = [types.SimpleNamespace(state={}) for _ in requests]
+        results = await asyncio.gather(
+            *(
+                tools.call_search_agent(r, c)
+                for r, c in zip(requests, contexts, strict=True)
+            ),
+            return_exceptions=True,
+        )
+        return results, contexts
+
+    return asyncio.run(run())
+
+
+def test_concurrent_identical_requests_run_once(search) -> None:
+    results, contexts = _call("gcloud zones", " gcloud zones ", "gcloud jobs")
+
+    assert search.calls == [{"request": "gcloud zones"}, {"request": "gcloud jobs"}]
+    assert results[0] == results[1] == "answer to gcloud zones"
+    assert [c.state["search_agent_output"] for c in contexts] == results
+    # A later identical request is served from the TTL cache.
+    assert _call("gcloud zones")[0] == ["answer to gcloud zones"]
+    assert len(search.calls) == 2
+
+
+def test_failure_reaches_waiters_and_is_not_cached(search) -> None:
+    search.error = RuntimeError("search backend down")
+
+    results, _ = _call("gcloud zones", "gcloud zones")
+
+    assert len(search.calls) == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert tools._search_inflight == {} and "gcloud zones" not in tools._search_cache
@@ -0,0 +1,42 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""SemanticCache lookups: expiry and the literal-token guard (no embedding calls)."""
+
+import numpy as np
+import pytest
+
+from app.utils import semantic_cache
+from app.utils.semantic_cache import SemanticCache
+
+VECTOR = np.array([1.0, 0.0], dtype=np.float32)
+
+
+def test_entries_expire_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(semantic_cache.time, "monotonic", lambda: now[0])
+    cache = SemanticCache(ttl_seconds=300)
+    cache.add(VECTOR, "list zones", "answer")
+
+    now[0] += 299
+    assert cache.lookup(VECTOR, "list zones") == "answer"
+    now[0] += 1
+    assert cache.lookup(VECTOR, "list zones") is None
+
+
+def test_different_region_is_not_a_hit() -> None:
+    cache = SemanticCache()
+    cache.add(VECTOR, "list zones in us-central1", "us answer")
+
+    assert cache.lookup(VECTOR, "List zones in us-central1") == "us answer"
+    assert cache.lookup(VECTOR, "list zones in europe-west1") is None
@@ -0,0 +1,122 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Storage utils against an in-memory GCS (see conftest.FakeGCS)."""
+
+import json
+
+import pytest
+
+from app.sub_agents.storage import utils
+
+STRATEGIES = (utils.STRATEGIES_BUCKET, "strategies.json")
+BUSINESS_CONFIG = (utils.BUSINESS_CONFIG_BUCKET, "business_config.json")
+
+
+def test_create_all_files_when_neither_exists(fake_gcs) -> None:
+    uris = utils.create_all_files({"name": "Acme", "budget": 10})
+
+    assert uris == {
+        "strategies": "gs://{}/{}".format(*STRATEGIES),
+        "business_config": "gs://{}/{}".format(*BUSINESS_CONFIG),
+    }
+    assert json.loads(fake_gcs.objects[STRATEGIES][0]) == []
+    config = json.loads(fake_gcs.objects[BUSINESS_CONFIG][0])
+    assert config["name"] == "Acme" and config["budget"] == 10
+
+
+def test_create_all_files_leaves_existing_strategies_untouched(fake_gcs) -> None:
+    fake_gcs.put(*STRATEGIES, b'[{"strategy_id": "keep"}]')
+
+    with pytest.raises(FileExistsError):
+        utils.create_all_files({"name": "Acme"})
+
+    assert fake_gcs.objects[STRATEGIES][0] == b'[{"strategy_id": "keep"}]'
+    assert BUSINESS_CONFIG not in fake_gcs.objects
+
+
+def test_create_all_files_rolls_back_when_config_exists(fake_gcs) -> None:
+    fake_gcs.put(*BUSINESS_CONFIG, b'{"name": "Existing"}')
+
+    with pytest.raises(FileExistsError):
+        utils.create_all_files({"name": "Acme"})
+
+    assert STRATEGIES not in fake_gcs.objects
+    assert fake_gcs.objects[BUSINESS_CONFIG][0] == b'{"name": "Existing"}'
+
+
+def _strategies(fake_gcs) -> list:
+    return json.loads(fake_gcs.objects[STRATEGIES][0])
+
+
+def test_apply_strategy_changes_saves_once(fake_gcs) -> None:
+    fake_gcs.put(*STRATEGIES, b'[{"strategy_id": "a"}, {"strategy_id": "b"}]')
+
+    result = utils.apply_strategy_changes(
+        create=[{"strategy_name": "new"}],
+        update=[{"strategy_id": "a", "strategy_name": "renamed"}],
+        delete=["b", "missing"],
+    )
+
+    assert fake_gcs.uploads == [STRATEGIES]
+    assert result["updated"] == ["a"] and result["deleted"] == ["b"]
+    assert result["not_found"] == ["missing"]
+    stored = _strategies(fake_gcs)
+    assert [s["strategy_id"] for s in stored] == ["a", *result["created"]]
+    assert stored[0]["strategy_name"] == "renamed"
+
+
+def test_lost_generation_race_is_replayed(fake_gcs, monkeypatch) -> None:
+    fake_gcs.put(*STRATEGIES, b'[{"strategy_id": "a"}]')
+    monkeypatch.setattr(utils, "_backoff", lambda attempt: None)
+    upload = utils.upload_json
+
+    def racing_upload(*args, **kwargs):
+        # Another writer saves between our read and our conditional upload, once.
+        monkeypatch.setattr(utils, "upload_json", upload)
+        fake_gcs.put(*STRATEGIES, b'[{"strategy_id": "a"}, {"strategy_id": "theirs"}]')
+        return upload(*args, **kwargs)
+
+    monkeypatch.setattr(utils, "upload_json", racing_upload)
+    new_id = utils.create_strategy({"strategy_name": "ours"})
+
+    assert [s["strategy_id"] for s in _strategies(fake_gcs)] == ["a", "theirs", new_id]
+
+
+def test_unchanged_strategies_are_served_from_cache(fake_gcs) -> None:
+    fake_gcs.put(*STRATEGIES, b'[{"strategy_id": "a"}]')
+
+    first = utils.get_strategies_file()
+    second = utils.get_strategies_file()
+
+    assert second is first
+    assert (fake_gcs.metadata_gets, fake_gcs.downloads) == (2, 1)
+
+    fake_gcs.put(*STRATEGIES, b'[{"strategy_id": "b"}]')
+    assert utils.get_strategies_file() == [{"strategy_id": "b"}]
+    assert fake_gcs.downloads == 2
+
+
+def test_writes_leave_earlier_reads_untouched(fake_gcs) -> None:
+    fake_gcs.put(*STRATEGIES, b'[{"strategy_id": "a", "strategy_name": "old"}]')
+    before = utils.get_strategies_file()
+
+    utils.update_strategy_by_id({"strategy_id": "a", "strategy_name": "new"})
+    new_id = utils.create_strategy({"strategy_name": "other"})
+
+    assert before == [{"strategy_id": "a", "strategy_name": "old"}]
+    after = utils.get_strategies_file()
+    assert [s["strategy_id"] for s in after] == ["a", new_id]
+    assert after[0]["strategy_name"] == "new"
+    # Our own save refreshed the cache, so that read needed no download.
+    assert fake_gcs.downloads == 1